@@ -594,7 +594,7 @@ def process_fbl3n_data(db_cfg: dict, data_cfg: dict, recon_cfg: dict,
 		if not db.store_data(_pg_conn, schema, cocd,data, money_curr):
 			return False
 
-		rec.save_state(cntry, "db_updated", True)
+		rec.save_state(cntry, "db_updated", True, force = True)
 
 	return True
 
@@ -1624,7 +1624,7 @@ def set_completed(cntry: str) -> None:
 	None.
 	"""
 
-	rec.save_state(cntry, "reconciled", True)
+	rec.save_state(cntry, "reconciled", True, force = True)
 
 def is_reconciled(cntry: str) -> bool:
 	"""
@@ -361,8 +361,8 @@ def get_text_summary(conn: Connection, schema: str, cocd: str, acc: Union[str, i
     ).sum().reset_index().sort_values("Text")
 
     result["LC_Amount_Sum"] = result["LC_Amount_Sum"].round(2)
-    result["Category"] = result["Category"].astype("object").astype("category")
-    result["Condition"] = result["Condition"].astype("object").astype("category")
+    categ_cols = ["Category", "Condition"]
+    result[categ_cols] = result[categ_cols].astype("object").astype("category")
 
     return result
 
@@ -482,21 +482,24 @@ def copy(loc_conn: Connection, rem_conn: Connection, loc_schema: str,
         src_res = loc_conn.execute(select_stmt)
         src_data = DataFrame(src_res.fetchall())
 
-        src_data["Fiscal_Year"] = src_data["Fiscal_Year"].astype("UInt16")
-        src_data["GL_Account"] = src_data["GL_Account"].astype("UInt32")
-        src_data["Customer"] = src_data["Customer"].astype("UInt32")
-        src_data["Agreement"] = src_data["Agreement"].astype("UInt32")
-        src_data["Period"] = src_data["Period"].astype("UInt8")
-        src_data["Document_Number"] = src_data["Document_Number"].astype("Int64")
-        src_data["Clearing_Document"] = src_data["Clearing_Document"].astype("Int64")
-        src_data["Text"] = src_data["Text"].astype("string")
-        src_data["Assignment"] = src_data["Assignment"].astype("category")
-        src_data["Business_Area"] = src_data["Business_Area"].astype("category")
-        src_data["Document_Type"] = src_data["Document_Type"].astype("category")
-        src_data["Tax_Code"] = src_data["Tax_Code"].astype("category")
-        src_data["Condition"] = src_data["Condition"].astype("category")
-        src_data["Category"] = src_data["Category"].astype("category")
-        src_data["Posting_Key"] = src_data["Posting_Key"].astype("category")
+        # all fields are converted at once instead of one by one
+        src_data = src_data.astype({
+            "Fiscal_Year": "UInt16",
+            "GL_Account": "UInt32",
+            "Customer": "UInt32",
+            "Agreement": "UInt32",
+            "Period": "UInt8",
+            "Document_Number": "Int64",
+            "Clearing_Document": "Int64",
+            "Text": "string",
+            "Assignment": "category",
+            "Business_Area": "category",
+            "Document_Type": "category",
+            "Tax_Code": "category",
+            "Condition": "category",
+            "Category": "category",
+            "Posting_Key": "category"
+        }, copy = False)
 
         stored = store_data(rem_conn, src_data, cocd, rem_schema, rem_monetary)
 
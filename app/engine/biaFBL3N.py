@@ -7,8 +7,9 @@ text file.
 """
 
 from datetime import date
-from os.path import exists, isfile, split
-from pyperclip import copy as copy_to_clipboard
+from functools import lru_cache
+from os.path import exists, isfile, split, splitext
+import win32clipboard
 from win32com.client import CDispatch
 
 # custom warnings
@@ -82,6 +83,13 @@ _vkeys = {
     "CtrlShiftF6": 42
 }
 
+# line item selection options to radio button names mapping
+_item_selections = {
+    "all_items":     "X_AISEL",
+    "open_items":    "X_OPSEL",
+    "cleared_items": "X_CLSEL"
+}
+
 def _is_sap_runtime_error(main_wnd: CDispatch) -> bool:
     """
     Checks if a SAP ABAP runtime error exists.
@@ -103,23 +111,23 @@ def _is_error_message(sbar: CDispatch) -> bool:
 
     return False
 
-def _is_popup_dialog() -> bool:
+def _is_popup_dialog(wnd: CDispatch) -> bool:
     """
     Checks if the active window
     is a popup dialog window.
     """
 
-    if _sess.ActiveWindow.type == "GuiModalWindow":
+    if wnd.type == "GuiModalWindow":
         return True
 
     return False
 
-def _close_popup_dialog(confirm: bool):
+def _close_popup_dialog(wnd: CDispatch, confirm: bool):
     """
     Confirms or delines a pop-up dialog.
     """
 
-    if _sess.ActiveWindow.text == "Information":
+    if wnd.text == "Information":
         if confirm:
             _main_wnd.SendVKey(_vkeys["Enter"]) # confirm
         else:
@@ -128,7 +136,7 @@ def _close_popup_dialog(confirm: bool):
 
     btn_caption = "Yes" if confirm else "No"
 
-    for child in _sess.ActiveWindow.Children:
+    for child in wnd.Children:
         for grandchild in child.Children:
             if grandchild.Type != "GuiButton":
                 continue
@@ -137,7 +145,23 @@ def _close_popup_dialog(confirm: bool):
             grandchild.Press()
             return
 
-def _set_company_code(val: str):
+def _set_clipboard_text(txt: str) -> None:
+    """
+    Places text into the Windows clipboard.
+
+    An empty text only clears the clipboard.
+    """
+
+    win32clipboard.OpenClipboard()
+
+    try:
+        win32clipboard.EmptyClipboard()
+        if txt != "":
+            win32clipboard.SetClipboardData(win32clipboard.CF_UNICODETEXT, txt)
+    finally:
+        win32clipboard.CloseClipboard()
+
+def _set_company_code(main_wnd: CDispatch, val: str):
     """
     Enters company code into the 'Company code'
     field located on the main transaction window.
@@ -147,19 +171,19 @@ def _set_company_code(val: str):
         raise ValueError(f"Invalid company code used: {val}. "
         "A valid value is a 4-digit number (e.g. '0075').")
 
-    if _main_wnd.findAllByName("SD_BUKRS-LOW", "GuiCTextField").count > 0:
-        _main_wnd.findByName("SD_BUKRS-LOW", "GuiCTextField").text = val
-    elif _main_wnd.findAllByName("SO_WLBUK-LOW", "GuiCTextField").count > 0:
-        _main_wnd.findByName("SO_WLBUK-LOW", "GuiCTextField").text = val
+    if main_wnd.findAllByName("SD_BUKRS-LOW", "GuiCTextField").count > 0:
+        main_wnd.findByName("SD_BUKRS-LOW", "GuiCTextField").text = val
+    elif main_wnd.findAllByName("SO_WLBUK-LOW", "GuiCTextField").count > 0:
+        main_wnd.findByName("SO_WLBUK-LOW", "GuiCTextField").text = val
 
-def _set_layout(val: str):
+def _set_layout(main_wnd: CDispatch, val: str):
     """
     Enters layout name into the 'Layout' field
     located on the main transaction window.
     """
-    _main_wnd.findByName("PA_VARI", "GuiCTextField").text = val
+    main_wnd.findByName("PA_VARI", "GuiCTextField").text = val
 
-def _set_accounts(vals: list):
+def _set_accounts(main_wnd: CDispatch, vals: list):
 
     if len(vals) == 0:
         raise ValueError("No GL account provided!")
@@ -173,29 +197,26 @@ def _set_accounts(vals: list):
     accs = list(map(str, vals))
 
     # open selection table for company codes
-    _main_wnd.findByName("%_SD_SAKNR_%_APP_%-VALU_PUSH", "GuiButton").press()
+    main_wnd.findByName("%_SD_SAKNR_%_APP_%-VALU_PUSH", "GuiButton").press()
 
-    _main_wnd.SendVKey(_vkeys["ShiftF4"])   # clear any previous values
-    copy_to_clipboard("\r\n".join(accs))    # copy accounts to clipboard
-    _main_wnd.SendVKey(_vkeys["ShiftF12"])  # confirm selection
-    copy_to_clipboard("")                   # clear the clipboard
-    _main_wnd.SendVKey(_vkeys["F8"])        # confirm
+    main_wnd.SendVKey(_vkeys["ShiftF4"])    # clear any previous values
+    _set_clipboard_text("\r\n".join(accs)) # copy accounts to clipboard
+    main_wnd.SendVKey(_vkeys["ShiftF12"])   # confirm selection
+    main_wnd.SendVKey(_vkeys["F8"])         # confirm
 
-def _choose_line_item_selection(option: str):
+def _choose_line_item_selection(main_wnd: CDispatch, option: str):
     """
     Selects the kind of items to load.
     """
 
-    if option == "all_items":
-        _main_wnd.findByName("X_AISEL", "GuiRadioButton").select()
-    elif option == "open_items":
-        _main_wnd.findByName("X_OPSEL", "GuiRadioButton").select()
-    elif option == "cleared_items":
-        _main_wnd.findByName("X_CLSEL", "GuiRadioButton").select()
-    else:
-        assert False, "Unrecognized selection option!"
+    btn_name = _item_selections.get(option)
+
+    if btn_name is None:
+        raise ValueError(f"Unrecognized selection option: {option}")
 
-def _set_posting_dates(first: date, last: date):
+    main_wnd.findByName(btn_name, "GuiRadioButton").select()
+
+def _set_posting_dates(main_wnd: CDispatch, first: date, last: date):
     """
     Enters first and last posting date into the
     fields of the 'All items' option located on
@@ -205,36 +226,41 @@ def _set_posting_dates(first: date, last: date):
     date_from = first.strftime("%d.%m.%Y")
     date_to = last.strftime("%d.%m.%Y")
 
-    _main_wnd.FindByName("SO_BUDAT-LOW", "GuiCTextField").text = date_from
-    _main_wnd.FindByName("SO_BUDAT-HIGH", "GuiCTextField").text = date_to
+    main_wnd.FindByName("SO_BUDAT-LOW", "GuiCTextField").text = date_from
+    main_wnd.FindByName("SO_BUDAT-HIGH", "GuiCTextField").text = date_to
 
-def _toggle_worklist(activate: bool):
+def _toggle_worklist(main_wnd: CDispatch, activate: bool):
     """
     Activates or deactivates the 'Use worklist'
     option in the transaction main search mask.
     """
 
-    used = _main_wnd.FindAllByName("PA_WLSAK", "GuiCTextField").Count > 0
+    used = main_wnd.FindAllByName("PA_WLSAK", "GuiCTextField").Count > 0
 
     if (activate or used) and not (activate and used):
-        _main_wnd.SendVKey(_vkeys["CtrlF1"])
+        main_wnd.SendVKey(_vkeys["CtrlF1"])
 
-def _select_data_format(idx: int) -> None:
+def _select_data_format(sess: CDispatch, idx: int) -> None:
     """
     Selects data export format from the export options
     dialog based on the option index on the list.
     """
 
-    option_wnd = _sess.FindById("wnd[1]")
-    option_wnd.FindAllByName("SPOPLI-SELFLAG", "GuiRadioButton")(idx).Select()
+    option_wnd = sess.FindById("wnd[1]")
+    option = option_wnd.FindAllByName("SPOPLI-SELFLAG", "GuiRadioButton")(idx)
+
+    # the format is usually preselected, so
+    # avoid re-selecting it in such a case
+    if not option.Selected:
+        option.Select()
 
-def _load_items() -> None:
+def _load_items(main_wnd: CDispatch, stat_bar: CDispatch) -> None:
     """Simulates pressing the 'Execute'
     button that triggers data loading.
     """
 
     try:
-        _main_wnd.SendVKey(_vkeys["F8"])
+        main_wnd.SendVKey(_vkeys["F8"])
     except Exception as exc:
         raise SapRuntimeError(f"Attempt to load items failed: {str(exc)}") from exc
 
@@ -243,11 +269,11 @@ def _load_items() -> None:
     # after pressing the 'Execute' button. Check:
 
     try:
-        msg = _stat_bar.Text
+        msg = stat_bar.Text
     except Exception as exc:
         raise ConnectionLostError("Connection to SAP lost due to an network error.") from exc
 
-    if _is_sap_runtime_error(_main_wnd):
+    if _is_sap_runtime_error(main_wnd):
         raise SapRuntimeError("SAP runtime error!")
 
     if "items displayed" not in msg:
@@ -259,36 +285,51 @@ def _load_items() -> None:
     if "The current transaction was reset" in msg:
         raise SapRuntimeError("FBL3N was unexpectedly terminated!")
 
-    if _is_error_message(_stat_bar):
+    if _is_error_message(stat_bar):
         raise ItemsLoadingError(msg)
 
-    if _main_wnd.text == 'ABAP Runtime Error':
+    if main_wnd.text == 'ABAP Runtime Error':
         raise AbapRuntimeError("Data loading failed due to an ABAP runtime error.")
 
-def _export_to_file(file_path: str, enc: str = "4120"):
+@lru_cache(maxsize = 32)
+def _folder_exists(path: str) -> bool:
+    """
+    Checks if an export folder exists.
+
+    The result is cached per folder path
+    to avoid repeated file system queries
+    when exporting multiple files into
+    the same folder.
+    """
+
+    return exists(path)
+
+def _export_to_file(sess: CDispatch, main_wnd: CDispatch, file_path: str, enc: str = "4120"):
     """
     Exports loaded accounting data into a text file.
     """
 
     folder_path, file_name = split(file_path)
+    ext = splitext(file_name)[1]
 
-    if not exists(folder_path):
+    if not _folder_exists(folder_path):
         raise FolderNotFoundError(f"Export folder not found: {folder_path}")
 
-    if not file_path.endswith(".txt"):
+    if ext.lower() != ".txt":
         raise ValueError(f"Invalid file type: {file_path}. "
         "Only '.txt' file types are supported.")
 
-    _main_wnd.SendVKey(_vkeys["F9"])     # open local data file export dialog
-    _select_data_format(0)               # set plain text data export format
-    _main_wnd.SendVKey(_vkeys["Enter"])  # confirm
+    main_wnd.SendVKey(_vkeys["F9"])      # open local data file export dialog
+    _select_data_format(sess, 0)         # set plain text data export format
+    main_wnd.SendVKey(_vkeys["Enter"])   # confirm
 
-    _sess.FindById("wnd[1]").FindByName("DY_PATH", "GuiCTextField").text = folder_path
-    _sess.FindById("wnd[1]").FindByName("DY_FILENAME", "GuiCTextField").text = file_name
-    _sess.FindById("wnd[1]").FindByName("DY_FILE_ENCODING", "GuiCTextField").text = enc
+    file_wnd = sess.FindById("wnd[1]")
+    file_wnd.FindByName("DY_PATH", "GuiCTextField").text = folder_path
+    file_wnd.FindByName("DY_FILENAME", "GuiCTextField").text = file_name
+    file_wnd.FindByName("DY_FILE_ENCODING", "GuiCTextField").text = enc
 
-    _main_wnd.SendVKey(_vkeys["CtrlS"])  # replace an exiting file
-    _main_wnd.SendVKey(_vkeys["F3"])     # Load main mask
+    main_wnd.SendVKey(_vkeys["CtrlS"])   # replace an exiting file
+    main_wnd.SendVKey(_vkeys["F3"])      # Load main mask
 
     # double check if data export succeeded
     if not isfile(file_path):
@@ -336,8 +377,12 @@ def close() -> None:
 
     _sess.EndTransaction()
 
-    if _is_popup_dialog():
-        _close_popup_dialog(confirm = True)
+    # fetch the active window only once
+    # and reuse it for the dialog checks
+    active_wnd = _sess.ActiveWindow
+
+    if _is_popup_dialog(active_wnd):
+        _close_popup_dialog(active_wnd, confirm = True)
 
     _sess = None
     _main_wnd = None
@@ -416,13 +461,19 @@ def export(file_path: str, cocd: str, gl_accs: list,
         "when it's actually not running! Use the biaFBL3N.start() procedure to run "
         "the transaction first of all.")
 
+    # bind the GUI objects locally once and pass
+    # them to the helpers to avoid global lookups
+    sess = _sess
+    main_wnd = _main_wnd
+    stat_bar = _stat_bar
+
     if layout is not None:
-        _set_layout(layout)
-
-    _toggle_worklist(activate = False)
-    _set_company_code(cocd)
-    _set_accounts(gl_accs)
-    _choose_line_item_selection(option = "all_items")
-    _set_posting_dates(from_day, to_day)
-    _load_items()
-    _export_to_file(file_path)
+        _set_layout(main_wnd, layout)
+
+    _toggle_worklist(main_wnd, activate = False)
+    _set_company_code(main_wnd, cocd)
+    _set_accounts(main_wnd, gl_accs)
+    _choose_line_item_selection(main_wnd, option = "all_items")
+    _set_posting_dates(main_wnd, from_day, to_day)
+    _load_items(main_wnd, stat_bar)
+    _export_to_file(sess, main_wnd, file_path)
@@ -6,7 +6,8 @@ from the standard SAP FS10N transaction table to a plain text file.
 """
 
 import logging
-from os.path import exists, isfile, split
+from functools import lru_cache
+from os.path import exists, isfile, split, splitext
 from typing import Union
 from win32com.client import CDispatch
 
@@ -52,34 +53,34 @@ _vkeys = {
     "CtrlShiftF9":  45
 }
 
-def _is_popup_dialog() -> bool:
+def _is_popup_dialog(wnd: CDispatch) -> bool:
     """
     Checks if the active window
     is a popup dialog window.
     """
 
-    if _sess.ActiveWindow.type == "GuiModalWindow":
+    if wnd.type == "GuiModalWindow":
         return True
 
     return False
 
-def _get_popup_text() -> str:
+def _get_popup_text(wnd: CDispatch) -> str:
     """
     Returns text message
     contained in a SAP pop-up
     window.
     """
 
-    txt = _sess.ActiveWindow.children(1).children(1).text
+    txt = wnd.children(1).children(1).text
 
     return txt
 
-def _close_popup_dialog(confirm: bool):
+def _close_popup_dialog(wnd: CDispatch, confirm: bool):
     """
     Confirms or delines a pop-up dialog.
     """
 
-    if _sess.ActiveWindow.text == "Information":
+    if wnd.text == "Information":
         if confirm:
             _main_wnd.SendVKey(_vkeys["Enter"]) # confirm
         else:
@@ -88,7 +89,7 @@ def _close_popup_dialog(confirm: bool):
 
     btn_caption = "Yes" if confirm else "No"
 
-    for child in _sess.ActiveWindow.Children:
+    for child in wnd.Children:
         for grandchild in child.Children:
             if grandchild.Type != "GuiButton":
                 continue
@@ -147,7 +148,12 @@ def _select_export_format(idx: int):
     grid_view.PressToolbarContextButton("&MB_EXPORT")
     grid_view.SelectContextMenuItem("&PC")
     optins_wnd = _sess.FindById("wnd[1]")
-    optins_wnd.FindAllByName("SPOPLI-SELFLAG", "GuiRadioButton")(idx).Select()
+    option = optins_wnd.FindAllByName("SPOPLI-SELFLAG", "GuiRadioButton")(idx)
+
+    # the format is usually preselected, so
+    # avoid re-selecting it in such a case
+    if not option.Selected:
+        option.Select()
 
 def _load_data():
     """
@@ -157,31 +163,48 @@ def _load_data():
 
     _main_wnd.SendVKey(_vkeys["F8"])
 
-    if _is_popup_dialog():
-        msg = _get_popup_text()
-        _close_popup_dialog(confirm = True)
+    active_wnd = _sess.ActiveWindow
+
+    if _is_popup_dialog(active_wnd):
+        msg = _get_popup_text(active_wnd)
+        _close_popup_dialog(active_wnd, confirm = True)
         raise NoDataFoundWarning(msg)
 
+@lru_cache(maxsize = 32)
+def _folder_exists(path: str) -> bool:
+    """
+    Checks if an export folder exists.
+
+    The result is cached per folder path
+    to avoid repeated file system queries
+    when exporting multiple files into
+    the same folder.
+    """
+
+    return exists(path)
+
 def _export_to_file(file_path: str, enc: str = "4120"):
     """
     Exports loaded accounting data to a text file.
     """
 
     folder_path, file_name = split(file_path)
+    ext = splitext(file_name)[1]
 
-    if not exists(folder_path):
+    if not _folder_exists(folder_path):
         raise FolderNotFoundError(f"Export folder not found: {folder_path}")
 
-    if not file_path.endswith(".txt"):
+    if ext.lower() != ".txt":
         raise ValueError(f"Invalid file type: {file_path}. "
         "Only '.txt' file types are supported.")
 
     _select_export_format(0)                    # select unconverted text data export format
     _main_wnd.SendVKey(_vkeys["Enter"])         # confirm
 
-    _sess.FindById("wnd[1]").FindByName("DY_PATH", "GuiCTextField").text = folder_path
-    _sess.FindById("wnd[1]").FindByName("DY_FILENAME", "GuiCTextField").text = file_name
-    _sess.FindById("wnd[1]").FindByName("DY_FILE_ENCODING", "GuiCTextField").text = enc
+    file_wnd = _sess.FindById("wnd[1]")
+    file_wnd.FindByName("DY_PATH", "GuiCTextField").text = folder_path
+    file_wnd.FindByName("DY_FILENAME", "GuiCTextField").text = file_name
+    file_wnd.FindByName("DY_FILE_ENCODING", "GuiCTextField").text = enc
 
     _main_wnd.SendVKey(_vkeys["CtrlS"])         # replace an exiting file
     _main_wnd.SendVKey(_vkeys["F3"])     # Load main mask
@@ -250,8 +273,12 @@ def close():
 
     _sess.EndTransaction()
 
-    if _is_popup_dialog():
-        _close_popup_dialog(confirm = True)
+    # fetch the active window only once
+    # and reuse it for the dialog checks
+    active_wnd = _sess.ActiveWindow
+
+    if _is_popup_dialog(active_wnd):
+        _close_popup_dialog(active_wnd, confirm = True)
 
     _sess = None
     _main_wnd = None
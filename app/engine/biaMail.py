@@ -1,4 +1,4 @@
-# pylint: disable = C0103, W0703, W1203
+# pylint: disable = C0103, W0703
 
 """
 The 'biaMail.py' module creates and sends of emails directly via SMTP server.
@@ -12,23 +12,24 @@ Version history:
                saving message attachments to a local file.
 """
 
-from email import encoders
+from base64 import encodebytes
 from email.mime.base import MIMEBase
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
+from functools import lru_cache
 import logging
 import os
-from os.path import exists, isfile, join, split
+from os.path import basename, exists, isfile, join
 import re
+from shutil import copyfileobj
 import socket
 from smtplib import SMTP
 from typing import Union
 
-import pandas as pd
 import exchangelib as xlib
 from exchangelib import (
-    Account, Build, Configuration,
-     Identity, Message, Version
+    Account, Configuration, FileAttachment,
+     Identity, Message
 )
 
 # custom message classes
@@ -93,6 +94,28 @@ class InvalidSmtpHostError(Exception):
 
 _logger = logging.getLogger("master")
 
+# precompiled regex patterns
+_LEDVANCE_RE = re.compile(r"\w+\.\w+@ledvance\.com")
+_COCD_RE = re.compile(r"\bCompany code:\s*(?P<cocd>\d{4})\b", re.I|re.M)
+_HAS_FX_RE = re.compile(r"fx rate", re.I|re.M)
+_FX_RATE_RE = re.compile(r"\bFX Rate:\s*(?P<rate>(\d*\.)?\d+[,.]\d+)", re.I|re.M)
+
+# buffer size used for writing attachment data (1 MiB)
+_ATT_BUFFER_SIZE = 1 << 20
+
+# amount thousands separators to remove
+_AMOUNT_SEPARATORS = str.maketrans("", "", ",. ")
+
+def _has_extension(file_name: str, ext: str) -> bool:
+    """
+    Checks if a file name ends with a lowercase \n
+    extension, ignoring the case of the file name.
+    """
+
+    # compare the name suffix only rather than
+    # lowercasing a copy of the entire name
+    return file_name[len(file_name) - len(ext):].lower() == ext
+
 def contains_attachment(msg: Message, ext: str = None) -> bool:
     """
     Checks if a message contains any attachments.
@@ -120,12 +143,21 @@ def contains_attachment(msg: Message, ext: str = None) -> bool:
     if ext is not None and not isinstance(ext, str):
         raise TypeError(f"Argument 'ext' has invalid type: {type(ext)}")
 
-    # perform evaluation
-    if ext is None and len(msg.attachments) > 0:
-        return True
+    # perform evaluation; the 'has_attachments' flag is a part
+    # of the message summary, so checking it first avoids any
+    # fetching of the attachments of attachment-free messages.
+    # The flag is None if it wasn't fetched with the message,
+    # hence only an explicit False skips the attachment check
+    if msg.has_attachments is False:
+        return False
+
+    if ext is None:
+        return len(msg.attachments) > 0
+
+    ext = ext.lower()
 
     for att in msg.attachments:
-        if att.name.lower().endswith(ext):
+        if _has_extension(att.name, ext):
             return True
 
     return False
@@ -152,13 +184,13 @@ def _sanitize_emails(addr: Union[str,list]) -> list:
         stripped = mail.strip()
         validated.append(stripped)
 
-        # check if email is Ledvance-specific
-        match = re.search(r"\w+\.\w+@ledvance.com", stripped)
-
-        if match is not None:
+        # check if email is Ledvance-specific; the cheap
+        # domain test rejects most foreign addresses
+        # without running the regex at all
+        if "@ledvance.com" in stripped and _LEDVANCE_RE.fullmatch(stripped) is not None:
             continue
 
-        _logger.warning(f"Possibly invalid email address used: '{stripped}'.")
+        _logger.warning("Possibly invalid email address used: '%s'.", stripped)
 
     return validated
 
@@ -169,20 +201,22 @@ def _attach_file(email: SmtpMessage, att_paths: list) -> SmtpMessage:
 
     for att_path in att_paths:
 
-        if not isfile(att_path):
-            raise AttachmentNotFoundError(f"Attachment not found: {att_path}")
-
-        with open(att_path, "rb") as file:
-            payload = file.read()
+        try:
+            with open(att_path, "rb", buffering = _ATT_BUFFER_SIZE) as file:
+                payload = encodebytes(file.read()).decode("ascii")
+        except FileNotFoundError as exc:
+            raise AttachmentNotFoundError(f"Attachment not found: {att_path}") from exc
 
         # The content type "application/octet-stream" means
-        # that a MIME attachment is a binary file
+        # that a MIME attachment is a binary file. The payload
+        # is set already encoded rather than re-encoding the
+        # raw data in place.
         part = MIMEBase("application", "octet-stream")
         part.set_payload(payload)
-        encoders.encode_base64(part)
+        part["Content-Transfer-Encoding"] = "base64"
 
         # get file name
-        file_name = split(att_path)[1]
+        file_name = basename(att_path)
 
         # Add header
         part.add_header(
@@ -263,6 +297,82 @@ def create_message(from_addr: str, to_addr: Union[str,list], subj: str,
 
     return email
 
+class SmtpSession:
+    """
+    A context manager that keeps a connection
+    to an SMTP server open so that multiple
+    messages can be sent over it.
+
+    Usage:
+    ------
+    with SmtpSession(host, port) as smtp_sess:
+        for msg in msgs:
+            smtp_sess.send(msg)
+    """
+
+    def __init__(self, host: str, port: int):
+
+        if not isinstance(host, str):
+            raise TypeError(f"Argument 'host' has invalid type: {type(host)}")
+
+        if not isinstance(port, int):
+            raise TypeError(f"Argument 'port' has invalid type: {type(port)}" )
+
+        self._host = host
+        self._port = port
+        self._conn = None
+
+    def __enter__(self):
+
+        try:
+            self._conn = SMTP(self._host, self._port, timeout = 30)
+        except socket.gaierror as exc:
+            raise InvalidSmtpHostError(f"Invalid SMTP host name: {self._host}") from exc
+        except TimeoutError as exc:
+            raise TimeoutError("Attempt to connect to the SMTP servr timed out! Possible reasons: "
+            "Slow internet connection or an incorrect port number used.") from exc
+
+        self._conn.set_debuglevel(0) # off = 0; verbose = 1; timestamped = 2
+
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+
+        try:
+            self._conn.quit()
+        except Exception:
+            self._conn.close()
+
+        self._conn = None
+
+    def send(self, msg: SmtpMessage):
+        """
+        Sends a message over the open connection.
+
+        Params:
+        ------
+        msg:
+            A SmtpMessage object representing the email to send.
+
+        Returns:
+        --------
+        None.
+
+        Raises:
+        -------
+        UndeliveredWarning:
+            When message fails to reach all the required recipients.
+        """
+
+        if not isinstance(msg, SmtpMessage):
+            raise TypeError(f"Argument 'msg' has invalid type {type(msg)}")
+
+        send_errs = self._conn.sendmail(msg["From"], msg["To"].split(";"), msg.as_string())
+
+        if len(send_errs) != 0:
+            undelivered = ';'.join(send_errs.keys())
+            raise UndeliveredWarning(f"Message undelivered to: {undelivered}")
+
 def send_smtp_message(msg: SmtpMessage, host: str, port: int):
     """
     Sends a message using an SMTP server.
@@ -298,25 +408,8 @@ def send_smtp_message(msg: SmtpMessage, host: str, port: int):
     if not isinstance(msg, SmtpMessage):
         raise TypeError(f"Argument 'msg' has invalid type {type(msg)}")
 
-    if not isinstance(host, str):
-        raise TypeError(f"Argument 'host' has invalid type: {type(host)}")
-
-    if not isinstance(port, int):
-        raise TypeError(f"Argument 'port' has invalid type: {type(port)}" )
-
-    try:
-        with SMTP(host, port, timeout = 30) as smtp_conn:
-            smtp_conn.set_debuglevel(0) # off = 0; verbose = 1; timestamped = 2
-            send_errs = smtp_conn.sendmail(msg["From"], msg["To"].split(";"), msg.as_string())
-    except socket.gaierror as exc:
-        raise InvalidSmtpHostError(f"Invalid SMTP host name: {host}") from exc
-    except TimeoutError as exc:
-        raise TimeoutError("Attempt to connect to the SMTP servr timed out! Possible reasons: "
-        "Slow internet connection or an incorrect port number used.") from exc
-
-    if len(send_errs) != 0:
-        undelivered = ';'.join(send_errs.keys())
-        raise UndeliveredWarning(f"Message undelivered to: {undelivered}")
+    with SmtpSession(host, port) as smtp_sess:
+        smtp_sess.send(msg)
 
 def save_attachments(msg: Message, folder_path: str, ext: str = None) -> list:
     """
@@ -354,21 +447,30 @@ def save_attachments(msg: Message, folder_path: str, ext: str = None) -> list:
 
     file_paths = []
 
-    for att in msg.attachments:
+    if msg.has_attachments is False:
+        return file_paths
 
-        file_path = join(folder_path, att.name)
+    if ext is not None:
+        ext = ext.lower()
 
-        if not (ext is None or file_path.lower().endswith(ext)):
+    for att in msg.attachments:
+
+        if not (ext is None or _has_extension(att.name, ext)):
             continue
 
+        file_path = join(folder_path, att.name)
+
+        # file attachments are streamed from the server in chunks
+        # rather than loaded into memory as a whole at once
         try:
-            with open(file_path, 'wb') as a_file:
-                a_file.write(att.content)
+            with open(file_path, 'wb', buffering = _ATT_BUFFER_SIZE) as a_file:
+                if isinstance(att, FileAttachment):
+                    with att.fp as att_stream:
+                        copyfileobj(att_stream, a_file, _ATT_BUFFER_SIZE)
+                else:
+                    a_file.write(att.content)
         except Exception as exc:
-            raise AttachmentSavingError from exc
-
-        if not isfile(file_path):
-            raise AttachmentSavingError(f"Error writing attachment data to file: {file_path}")
+            raise AttachmentSavingError(f"Error writing attachment data to file: {file_path}") from exc
 
         file_paths.append(file_path)
 
@@ -396,19 +498,29 @@ def get_attachments(msg: Message, ext: str = None) -> list:
 
     atts = []
 
+    if msg.has_attachments is False:
+        return atts
+
+    if ext is not None:
+        ext = ext.lower()
+
     for att in msg.attachments:
 
-        if not (ext is None or att.name.lower().endswith(ext)):
+        if not (ext is None or _has_extension(att.name, ext)):
             continue
 
         atts.append(att.content)
 
     return atts
 
+@lru_cache(maxsize = 16)
 def get_credentials(acc_name: str) -> Credentials:
     """
     Returns credentails for a given account.
 
+    The credentials file is read only once per account, \n
+    any subsequent calls return the cached object.
+
     Params:
     -------
     acc_name:
@@ -451,33 +563,32 @@ def get_credentials(acc_name: str) -> Credentials:
         identity = Identity(primary_smtp_address = acc_name)
     )
 
-    for line in lines:
+    # credentials file param names to params keys mapping
+    keys = {
+        "Client ID": "client_id",
+        "Client Secret": "client_secret",
+        "Tenant ID": "tenant_id"
+    }
 
-        if ":" not in line:
-            continue
+    for line in lines:
 
-        tokens = line.split(":")
-        param_name = tokens[0].strip()
-        param_value = tokens[1].strip()
+        param_name, sep, param_value = line.partition(":")
+        key = keys.get(param_name.strip())
 
-        if param_name == "Client ID":
-            key = "client_id"
-        elif param_name == "Client Secret":
-            key = "client_secret"
-        elif param_name == "Tenant ID":
-            key = "tenant_id"
+        if not sep or key is None:
+            continue
 
-        params[key] = param_value
+        params[key] = param_value.strip()
 
     # verify loaded parameters
     if params["client_id"] is None:
-        ParamNotFoundError("Parameter 'client_id' not found!")
+        raise ParamNotFoundError("Parameter 'client_id' not found!")
 
     if params["client_secret"] is None:
-        ParamNotFoundError("Parameter 'client_secret' not found!")
+        raise ParamNotFoundError("Parameter 'client_secret' not found!")
 
     if params["tenant_id"] is None:
-        ParamNotFoundError("Parameter 'tenant_id' not found!")
+        raise ParamNotFoundError("Parameter 'tenant_id' not found!")
 
     # params OK, create credentials
     creds = Credentials(
@@ -510,14 +621,6 @@ def get_account(mailbox: str, creds: Credentials, x_server: str) -> Account:
     An exchangelib.Account object.
     """
 
-    build = Build(major_version = 15, minor_version = 20)
-
-    cfg = Configuration(creds,
-        server = x_server,
-        auth_type = xlib.OAUTH2,
-        version = Version(build)
-    )
-
     cfg = Configuration(server = x_server, credentials = creds)
 
     acc = Account(mailbox,
@@ -557,16 +660,17 @@ def get_message(acc: Account, email_id: str) -> Message:
     if not (email_id.startswith("<") and email_id.endswith(">")):
         email_id = f"<{email_id}>"
 
-    # process
-    emails = acc.inbox.walk().filter(message_id = email_id).only(
+    # process; fetch at most two matching messages in a single
+    # request, which is enough to detect any ambiguous message ID
+    emails = list(acc.inbox.walk().filter(message_id = email_id).only(
         'subject', 'text_body', 'headers', 'sender',
-        'attachments', 'datetime_received', 'message_id'
-    )
+        'attachments', 'has_attachments', 'datetime_received', 'message_id'
+    )[:2])
 
-    if emails.count() == 0:
+    if len(emails) == 0:
         return None
 
-    if emails.count() > 1:
+    if len(emails) > 1:
         raise MultipleMessagesWarning(
             "Found more than one message "
             f"with message ID: {email_id}"
@@ -580,29 +684,18 @@ def _parse_amount(num: str, ndigits: int = 2) -> float:
     in the standard SAP format.
     """
 
-    sign = "-"
-    val = num
-
-    if val.startswith("-"):
-        val = val.lstrip("-")
-    elif val.endswith("-"):
-        val = val.rstrip("-")
-    else:
-        sign = ""
-
-    tokens = re.split(r"\D", val)
+    val = num.strip()
+    sign = "-" if val.startswith("-") or val.endswith("-") else ""
+    val = val.strip("-")
 
-    if len(tokens) == 1:
-        val = tokens[0]
-    else:
-        # concat tokens
-        val = "".join(tokens[:-1])
-        val = sign + val + "." + tokens[-1]
+    # the last separator delimits the decimal places,
+    # any preceding separators are thousands separators
+    idx = max(val.rfind(","), val.rfind("."))
 
-    conv = pd.to_numeric(val)
-    rounded = round(conv, ndigits)
+    if idx != -1:
+        val = val[:idx].translate(_AMOUNT_SEPARATORS) + "." + val[idx + 1:]
 
-    return float(rounded)
+    return round(float(sign + val), ndigits)
 
 def extract_user_data(msg: Message) -> dict:
     """
@@ -624,12 +717,14 @@ def extract_user_data(msg: Message) -> dict:
     """
 
     email_addr = msg.sender.email_address
-    sender_name = msg.sender.name.split(",")[1].strip()
-    sender_surname = msg.sender.name.split(",")[0]
+    sender_surname, _, sender_name = msg.sender.name.partition(",")
+    sender_name = sender_name.strip()
+
+    # fetch the message body only once
+    body = msg.text_body
 
     cocd = None
-    cocd_patt = r"Company code:\s*(?P<cocd>\d{4})"
-    cocd_match = re.search(cocd_patt, msg.text_body, re.I|re.M)
+    cocd_match = _COCD_RE.search(body)
 
     if cocd_match is not None:
         cocd = cocd_match.group("cocd")
@@ -642,15 +737,17 @@ def extract_user_data(msg: Message) -> dict:
         "incomplete": False
     }
 
-    # check if there's any fx rate value supplied
-    if re.search("fx rate", msg.text_body, re.I|re.M) is not None:
-        rate = None
-        rate_patt = r"FX Rate:\s*(?P<rate>(\d*\.)?\d+[,.]\d+)"
-        rate_match = re.search(rate_patt, msg.text_body, re.I|re.M)
-        if rate_match is not None:
-            rate = _parse_amount(rate_match.group("rate"))
-            rate = None if rate <= 0 else rate # exchange rate cannot be negative or zero
+    # check if there's any fx rate value supplied; the body
+    # is probed for a bare 'fx rate' mention only if no valid
+    # rate value is found in order to flag the data incomplete
+    rate_match = _FX_RATE_RE.search(body)
+
+    if rate_match is not None:
+        rate = _parse_amount(rate_match.group("rate"))
+        rate = None if rate <= 0 else rate # exchange rate cannot be negative or zero
         params.update({"fx_rate": rate})
+    elif _HAS_FX_RE.search(body) is not None:
+        params.update({"fx_rate": None})
 
     if params["company_code"] is None or ("fx_rate" in params and params["fx_rate"] is None):
         params.update({"incomplete": True})
@@ -1,4 +1,4 @@
-# pylint: disable = C0103, W1203
+# pylint: disable = C0103
 
 """
 The 'biaWeb.py' module mediates fetching of currency
@@ -10,6 +10,7 @@ from datetime import date, datetime, timedelta
 import logging
 import requests
 import urllib3
+from requests.adapters import HTTPAdapter
 from requests.exceptions import ReadTimeout
 
 class ResponseError(Exception):
@@ -28,6 +29,74 @@ _allowed_currs = [
 
 _logger = logging.getLogger("master")
 
+_FX_RATES_URL = "https://app-mchcla02.mch.osram.de:4127/fxrates/getfxrate"
+
+# a shared session keeps connections to the
+# portal server alive between rate requests
+_session = requests.Session()
+_session.verify = False
+_session.headers.update({
+    "content-type": "application/json",
+    "connection": "keep-alive"
+})
+_session.mount("https://", HTTPAdapter(pool_connections = 4, pool_maxsize = 16))
+
+def _fetch_exchange_rate(valid_on: date, to_curr: str, from_curr: str, resp_timeout: int) -> float:
+    """
+    Requests the exchange rate
+    from the portal server.
+    """
+
+    payload = [
+        {"name": "tsdate",   "type": "Date",    "value": valid_on.isoformat()},
+        {"name": "fromto",   "type": "VarChar", "value": "to"},
+        {"name": "currency", "type": "VarChar", "value": to_curr},
+        {"name": "notation", "type": "VarChar", "value": "MN"}
+    ]
+
+    try:
+        resp = _session.post(
+            url = _FX_RATES_URL,
+            json = payload,
+            timeout = resp_timeout
+        )
+    except ReadTimeout as exc:
+        raise TimeoutError(str(exc)) from exc
+
+    if not resp.ok:
+        raise ResponseError(resp.reason)
+
+    data = dict(resp.json())
+
+    for itm in data["data"]:
+        if itm["CurFrom"] == from_curr:
+            return itm["MidRate"]
+
+    return None
+
+# rates published for past days never change, so these can be
+# safely reused within a run; rates that weren't found are not
+# stored, so that these are requested again on the next call
+_cached_rates: dict = {}
+
+def _fetch_cached_exchange_rate(valid_on: date, to_curr: str, from_curr: str, resp_timeout: int) -> float:
+    """
+    Returns a cached exchange rate or
+    requests the rate from the portal
+    server if it's not cached yet.
+    """
+
+    key = (valid_on, to_curr, from_curr)
+    rate = _cached_rates.get(key)
+
+    if rate is None:
+        rate = _fetch_exchange_rate(valid_on, to_curr, from_curr, resp_timeout)
+
+        if rate is not None:
+            _cached_rates[key] = rate
+
+    return rate
+
 def get_exchange_rate(valid_on: date, to_curr: str, from_curr: str = "EUR", resp_timeout: int = 15) -> float:
     """
     Returns the exchange rate for converting an amount \n
@@ -70,51 +139,16 @@ def get_exchange_rate(valid_on: date, to_curr: str, from_curr: str = "EUR", resp
         raise ValueError(f"Argument 'from_curr' has incorrect value: {from_curr}")
 
     _logger.debug(
-        "Exchange rate params: "
-        f"from = '{from_curr}', "
-        f"to = '{to_curr}', "
-        f"day = {valid_on.strftime('%d.%m.%Y')}"
+        "Exchange rate params: from = '%s', to = '%s', day = %02d.%02d.%d",
+        from_curr, to_curr, valid_on.day, valid_on.month, valid_on.year
     )
 
     if from_curr == to_curr:
         return 1.0
 
-    payload = """[{
-        "name":"tsdate",
-        "type":"Date",
-        "value":"$date$"
-    }, {
-        "name":"fromto",
-        "type":"VarChar",
-        "value":"to"
-    }, {
-        "name":"currency",
-        "type":"VarChar",
-        "value":"$curr$"
-    }, {
-        "name":"notation",
-        "type":"VarChar",
-        "value":"MN"
-    }]""".replace("$curr$", to_curr).replace("$date$", valid_on.strftime("%Y-%m-%d"))
+    # rates for the current day may not be
+    # final yet, hence these aren't cached
+    if valid_on < datetime.now().date():
+        return _fetch_cached_exchange_rate(valid_on, to_curr, from_curr, resp_timeout)
 
-    try:
-        resp = requests.post(
-            url = "https://app-mchcla02.mch.osram.de:4127/fxrates/getfxrate",
-            headers = {"content-type": "application/json"},
-            verify = False,
-            data = payload,
-            timeout = resp_timeout
-        )
-    except ReadTimeout as exc:
-        raise TimeoutError(str(exc)) from exc
-
-    if not resp.ok:
-        raise ResponseError(resp.reason)
-
-    data = dict(resp.json())
-
-    for itm in data["data"]:
-        if itm["CurFrom"] == from_curr:
-            return itm["MidRate"]
-
-    return None
+    return _fetch_exchange_rate(valid_on, to_curr, from_curr, resp_timeout)
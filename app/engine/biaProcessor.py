@@ -6,18 +6,25 @@ direct operations on accounting data such as parsing, cleaning,
 conversion, evaluation and querying.
 """
 
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date
 from enum import Enum
-from io import StringIO
+from io import BytesIO
+from itertools import repeat
 import logging
 from multiprocessing import Pool
 import re
-from typing import Any, Union
+from types import MappingProxyType
+from typing import Any, Mapping, Union
 
 import numpy as np
 import pandas as pd
 from pandas import DataFrame, Series
-from pandas.api.types import infer_dtype
+from pandas.api.types import infer_dtype, union_categoricals
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv
+import pyarrow.feather
 
 from engine.biaUtils import deprecated
 
@@ -37,9 +44,52 @@ class FileTypes(Enum):
     TXT = "txt"
     DAT = "dat"
 
+class _LazyJoin:
+    """
+    Joins items into a string only when the
+    object gets formatted by a logging handler.
+    """
+
+    def __init__(self, sep: str, items) -> None:
+        self._sep = sep
+        self._items = items
+
+    def __str__(self) -> str:
+        return self._sep.join(map(str, self._items))
+
 _logger = logging.getLogger("master")
 
-_accum = {
+# standard SAP date format (DD.MM.YYYY)
+_SAP_DATE_FMT = "%d.%m.%Y"
+
+# precompiled regex patterns
+_NON_DIGIT_RE = re.compile(r"\D")
+
+# item line patterns operate on raw file bytes, where the lines
+# may end with '\r\n', hence '[^\r\n]' is used in place of '.';
+# the first group captures the line without the enclosing separators
+_FBL3N_ITEM_RE = re.compile(rb"^\|(\s+\d{4}\|[^\r\n]*)[^\r\n]", re.M)
+_SE16_ITEM_RE = re.compile(rb"^\|(\s*\d{3}\|[^\r\n]*)\|(?=\r?$)", re.M)
+_ZSD25_ITEM_RE = re.compile(rb"^\|(\s?\d{8}\s?\|[^\r\n]*)\|(?=\r?$)", re.M)
+_FS10N_ITEM_RE = re.compile(rb"\|([\d,T][^\r\n]*)\|", re.M)
+
+# pattern for the arrow regex kernel, the group names become token field names;
+# the lazy groups exclude the whitespace around the values, so the extracted
+# tokens come out already stripped
+_TEXT_TOKENS_PATT = (
+    r"^\s*(?P<Condition>[^;]*?)\s*;\s*(?P<Category>[^;]*?)\s*;"
+    r"\s*(?P<Customer>[^;]*?)\s*;\s*(?P<Agreement>[^;]*?)\s*"
+    r"(?:;\s*(?P<Note>[^;]*?)\s*)?(?:;|$)"
+)
+
+# kernel options are built once, so that the patterns
+# are not re-wrapped into new option objects on each call
+_TEXT_TOKENS_OPTS = pc.ExtractRegexOptions(_TEXT_TOKENS_PATT)
+_DIGITS_ONLY_OPTS = pc.MatchSubstringOptions(r"^\d+$")
+
+# the top-level data descriptors are fixed, hence
+# the accumulator is wrapped into a read-only proxy
+_accum: Mapping[str, dict] = MappingProxyType({
     "fbl3n_data": {},
     "text_summs": {},
     "check_text_summs": {},
@@ -57,6 +107,20 @@ _accum = {
     "yearly_acc_summ": {}, # raw data fot period overview pivot
     "period_overview": {},
     "info": {}
+})
+
+# GL account types accepted by the accumulator
+_VALID_ACC_TYPES = (int, np.integer)
+
+# maps arrow types to pandas extension dtypes to prevent
+# strings from being converted to python objects with None
+# as null value and nullable ints from being converted to floats
+_ARROW_DTYPES = {
+    pa.string(): pd.StringDtype("pyarrow"),
+    pa.uint8(): pd.UInt8Dtype(),
+    pa.uint16(): pd.UInt16Dtype(),
+    pa.uint32(): pd.UInt32Dtype(),
+    pa.uint64(): pd.UInt64Dtype()
 }
 
 _SE16_KOTE_HEADER = (
@@ -157,6 +221,34 @@ _FBL3N_HEADER = (
     "Text"
 )
 
+# fields of the FBL3N data that are stored as categories
+_FBL3N_CATEG_FIELDS = (
+    "Document_Type",
+    "Condition",
+    "Category",
+    "Posting_Key",
+    "Assignment",
+    "Business_Area",
+    "Tax_Code"
+)
+
+# the memory-optimized reader stores some of the numeric fields as categories too
+_FBL3N_OPT_CATEG_FIELDS = _FBL3N_CATEG_FIELDS + (
+    "GL_Account",
+    "Document_Number",
+    "Fiscal_Year"
+)
+
+# official categories of the accounting items
+_VALID_CATEGS = frozenset((
+    "B1", "B2", "B3", "B4",
+    "B5", "B6", "B7", "B8",
+    "BO", "C1", "C2", "C3",
+    "D1", "DS", "E1", "EM",
+    "FE", "FS", "S1", "SE",
+    "YJ", "EU", "GR"
+))
+
 _ZSD25_HEADER = (
     "Agreement",
     "Rebate_Recipient",
@@ -228,6 +320,14 @@ def clear():
 
     return
 
+def _is_valid_acc(acc: Any) -> bool:
+    """
+    Checks whether a value represents a valid GL account number.
+    """
+
+    # ints are accepted without conversion, only strings get scanned
+    return isinstance(acc, _VALID_ACC_TYPES) or (isinstance(acc, str) and acc.isdigit())
+
 def store_to_accum(data: Union[None, DataFrame], country: str, key: str, acc: Union[str, int] = None):
     """
     Stores data to the processor accumulator.
@@ -261,25 +361,18 @@ def store_to_accum(data: Union[None, DataFrame], country: str, key: str, acc: Un
     None.
     """
 
-    global _accum
-
-    if acc is not None and not str(acc).isnumeric():
+    if not (acc is None or _is_valid_acc(acc)):
         raise ValueError(f"The account used has incorrect value: {acc}")
 
-    if country in _accum[key] and acc is None:
-        raise RuntimeError("Cannot modify data that is already stored in the accumulator!")
-
-    if country in _accum[key] and acc is not None:
-        if acc in _accum[key][country]:
-            raise RuntimeError("Cannot modify data that is already stored in the accumulator!")
-
     if acc is None:
+        if country in _accum[key]:
+            raise RuntimeError("Cannot modify data that is already stored in the accumulator!")
         _accum[key][country] = data
     else:
-        if country not in _accum[key]:
-            _accum[key][country] = {}
-
-        _accum[key][country][acc] = data
+        acc_data = _accum[key].setdefault(country, {})
+        if acc in acc_data:
+            raise RuntimeError("Cannot modify data that is already stored in the accumulator!")
+        acc_data[acc] = data
 
     return
 
@@ -312,7 +405,7 @@ def get_from_accum(country: str, key: str, acc: Union[str, int] = None) -> DataF
     A DataFrame object representig the stored data.
     """
 
-    if acc is not None and not str(acc).isnumeric():
+    if not (acc is None or _is_valid_acc(acc)):
         raise ValueError(f"The account used has incorrect value: {acc}")
 
     if acc is None:
@@ -322,6 +415,7 @@ def get_from_accum(country: str, key: str, acc: Union[str, int] = None) -> DataF
 
     return data
 
+@deprecated("Use a vectorized version parse_amounts() instead.")
 def parse_amount(num: str, ndigits: int = 2) -> float:
     """
     Parses a string amount formatted
@@ -339,7 +433,7 @@ def parse_amount(num: str, ndigits: int = 2) -> float:
     else:
         sign = ""
 
-    tokens = re.split(r"\D", val)
+    tokens = _NON_DIGIT_RE.split(val)
 
     if len(tokens) == 1:
         val = tokens[0]
@@ -353,6 +447,47 @@ def parse_amount(num: str, ndigits: int = 2) -> float:
 
     return float(rounded)
 
+def parse_amounts(vals: Series) -> Series:
+    """
+    Parses string amounts formatted
+    as the standard SAP numeric format
+    into float literals.
+
+    Params:
+    -------
+    vals:
+        A Series object containing the string amounts.
+
+    Returns:
+    --------
+    A Series object containing the parsed amounts.
+    """
+
+    return _parse_amounts(vals)
+
+def _amounts_to_floats(arr: pa.Array) -> pa.Array:
+    """
+    Converts an arrow array of string amounts
+    formatted as the standard SAP numeric format
+    into an arrow array of floats.
+    """
+
+    # the amounts are processed by the arrow compute kernels
+    # directly on the string buffers, without creating
+    # intermediate python string objects per each value
+    arr = pc.replace_substring(arr, ".", "")
+    arr = pc.replace_substring(arr, ",", ".")
+
+    # empty fields represent missing amounts
+    arr = pc.if_else(pc.equal(arr, ""), pa.scalar(None, pa.string()), arr)
+
+    # SAP places the minus sign after the number
+    negative = pc.ends_with(arr, "-")
+    nums = pc.cast(pc.utf8_rtrim(arr, "-"), pa.float64())
+    nums = pc.if_else(negative, pc.negate(nums), nums)
+
+    return nums
+
 def _parse_amounts(vals: Series) -> Series:
     """
     Parses string amounts formatted
@@ -360,12 +495,108 @@ def _parse_amounts(vals: Series) -> Series:
     into rounded float literals.
     """
 
-    replaced = vals.str.replace(".", "", regex = False).str.replace(",", ".", regex = False)
-    replaced = replaced.mask(replaced.str.endswith("-"), "-" + replaced.str.rstrip("-"))
-    converted = pd.to_numeric(replaced).astype("float64")
+    arr = pa.array(vals, type = pa.string(), from_pandas = True)
+    nums = _amounts_to_floats(arr)
+
+    converted = Series(
+        nums.to_numpy(zero_copy_only = False),
+        index = vals.index, name = vals.name,
+        dtype = "float64"
+    )
+
+    return converted
+
+def _parse_rates(vals: Series) -> Series:
+    """
+    Parses string percentage rates formatted
+    as the standard SAP numeric format followed
+    by a percent sign into float literals.
+    """
+
+    # the percent sign and the spaces preceding it are
+    # trimmed by an arrow kernel instead of a regex replace
+    arr = pa.array(vals, type = pa.string(), from_pandas = True)
+    nums = _amounts_to_floats(pc.utf8_rtrim(arr, characters = " %"))
+
+    converted = Series(
+        nums.to_numpy(zero_copy_only = False),
+        index = vals.index, name = vals.name,
+        dtype = "float64"
+    )
 
     return converted
 
+def _parse_recipients(vals: Series) -> Series:
+    """
+    Converts string rebate recipient numbers
+    to integers, provided that all the values
+    are numeric. Otherwise, the original
+    values are returned.
+    """
+
+    # the check and the conversion are both done by arrow
+    # kernels, so the strings are scanned only once in C
+    arr = pa.array(vals, type = pa.string(), from_pandas = True)
+
+    if not pc.all(pc.match_substring_regex(arr, options = _DIGITS_ONLY_OPTS), min_count = 0).as_py():
+        return vals
+
+    converted = Series(
+        pc.cast(arr, pa.uint32()).to_numpy(zero_copy_only = False),
+        index = vals.index, name = vals.name,
+        dtype = "UInt32"
+    )
+
+    return converted
+
+def _parse_amounts_batch(data: DataFrame, cols: list) -> DataFrame:
+    """
+    Parses string amounts formatted as the
+    standard SAP numeric format stored in
+    multiple data fields in a single pass.
+    """
+
+    # stack the fields into one arrow array, so that each
+    # compute kernel scans all the amounts only once
+    arr = pa.concat_arrays([
+        pa.array(data[col], type = pa.string(), from_pandas = True)
+        for col in cols
+    ])
+
+    nums = _amounts_to_floats(arr).to_numpy(zero_copy_only = False)
+
+    # the fields were stacked in order and have equal
+    # lengths, so they're sliced back by reshaping
+    converted = DataFrame(
+        nums.reshape(len(cols), len(data)).T,
+        index = data.index, columns = cols,
+        dtype = "float64"
+    )
+
+    return converted
+
+def _sign_credit_amounts(data: DataFrame) -> np.ndarray:
+    """
+    Returns 'LC_Amount' values where positive
+    amounts of items with posting key 50 are
+    converted to negative amounts.
+    """
+
+    amounts = data["LC_Amount"].to_numpy()
+    keys = data["Posting_Key"].cat
+
+    if 50 not in keys.categories:
+        return amounts
+
+    # posting keys are compared as category codes; the mask is
+    # combined in place and the sign is flipped only where masked,
+    # so that no negated copy of all the amounts is created
+    credit = (keys.codes.to_numpy() == keys.categories.get_loc(50))
+    np.logical_and(credit, amounts > 0, out = credit)
+    signed = np.negative(amounts, out = amounts.copy(), where = credit)
+
+    return signed
+
 def _parse_dates(vals: Series) -> Series:
     """
     Parses string dates formatted
@@ -374,7 +605,9 @@ def _parse_dates(vals: Series) -> Series:
     objects.
     """
 
-    parsed = pd.to_datetime(vals, dayfirst = True, errors = "coerce").dt.date
+    # an explicit format lets pandas use its fast
+    # strptime path instead of inferring the format
+    parsed = pd.to_datetime(vals, format = _SAP_DATE_FMT, errors = "coerce").dt.date
 
     return parsed
 
@@ -385,18 +618,11 @@ def _parse_data(data: DataFrame) -> DataFrame:
     to appropriate data types.
     """
 
-    # remove leading and trailing spaces from string fields
-    # and replace empty strings with nan where appropriate
-    for col in data.columns:
-        if infer_dtype(data[col]) == "string":
-            data[col] = data[col].str.strip()
-
     # replace empty strings with null indicating either unused or missing
-    # (possibly as a result of a mistake during item posting) field values
-    data.loc[(data["Text"] == ""), "Text"] = pd.NA                   # missing val
-    data.loc[(data["Assignment"] == ""), "Assignment"] = pd.NA       # missing val
-    data.loc[(data["Tax_Code"] == ""), "Tax_Code"] = pd.NA           # unused val
-    data.loc[(data["Business_Area"] == ""), "Business_Area"] = pd.NA # unused val
+    # (possibly as a result of a mistake during item posting) field values:
+    # 'Text', 'Assignment' - missing val; 'Tax_Code', 'Business_Area' - unused val
+    na_cols = ["Text", "Assignment", "Tax_Code", "Business_Area"]
+    data[na_cols] = data[na_cols].mask(data[na_cols] == "", pd.NA)
 
     # open items have no clearing document, coerce filling empty recs with
     # null, otherwise convert to int where clearing document exsits
@@ -410,58 +636,48 @@ def _parse_data(data: DataFrame) -> DataFrame:
     data["GL_Account"] = data["GL_Account"].astype("UInt32")
     data["Period"] = data["Period"].astype("UInt8")
     data["Document_Number"] = data["Document_Number"].astype("Int64")
+
+    # document numbers are never negative and rarely need 64 bits,
+    # so the fields are downcast to the smallest unsigned int dtype
+    # that can safely hold all the values
+    data["Document_Number"] = pd.to_numeric(data["Document_Number"], downcast = "unsigned")
+    data["Clearing_Document"] = pd.to_numeric(data["Clearing_Document"], downcast = "unsigned")
+
     data["LC_Amount"] = _parse_amounts(data["LC_Amount"])
     data["Document_Date"] = _parse_dates(data["Document_Date"])
     data["Posting_Date"] = _parse_dates(data["Posting_Date"])
     data["Posting_Key"] = pd.to_numeric(data["Posting_Key"])
 
-    # extract accounting params separated by a semicolon
-    # from 'Text' field into separate fields
-    data["Tokens"] = data["Text"].str.split(";")
-
-    data = data.assign(
-        Condition = pd.NA,
-        Category = pd.NA,
-        Customer = pd.NA,
-        Agreement = pd.NA,
-        Note = pd.NA
-    )
-
-    # get only token records containig at least 4 values
-    idx = data[data["Tokens"].str.len() >= 4].index
-
-    data.loc[idx, "Condition"] = data.loc[idx, "Tokens"].str.get(0)
-    data.loc[idx, "Category"] = data.loc[idx, "Tokens"].str.get(1)
-    data.loc[idx, "Customer"] = data.loc[idx, "Tokens"].str.get(2)
-    data.loc[idx, "Agreement"] = data.loc[idx, "Tokens"].str.get(3)
-    data.loc[idx, "Note"] = data.loc[idx, "Tokens"].str.get(4) # returns none if token has no such index
-
-    data.drop("Tokens", axis = 1, inplace = True) # remove splitted text tokens from data
-
-    cond_idx = data[data["Condition"].notna()].index
-    categ_idx = data[data["Category"].notna()].index
-    note_idx = data[data["Note"].notna()].index
+    # extract accounting params separated by a semicolon from 'Text' field
+    # into separate fields; texts containing less than 4 values yield nulls.
+    # The extraction runs in a single pass over the arrow string buffer.
+    text = pa.array(data["Text"], type = pa.string(), from_pandas = True)
+    extracted = pc.extract_regex(text, options = _TEXT_TOKENS_OPTS)
+    tokens = {fld.name: vals for fld, vals in zip(extracted.type, extracted.flatten())}
+    null = pa.scalar(None, pa.string())
 
-    if not cond_idx.empty:
-        data.loc[cond_idx, "Condition"] = data.loc[cond_idx, "Condition"].str.strip()
-
-    if not categ_idx.empty:
-        data.loc[categ_idx, "Category"] = data.loc[categ_idx, "Category"].str.strip()
+    # replace incorrect extracted entries with nan
+    cond = tokens["Condition"]
+    tokens["Condition"] = pc.if_else(pc.equal(pc.utf8_length(cond), 4), cond, null)
+    categ = tokens["Category"]
+    tokens["Category"] = pc.if_else(pc.equal(pc.utf8_length(categ), 2), categ, null)
 
-    if not note_idx.empty:
-        data.loc[note_idx, "Note"] = data.loc[note_idx, "Note"].str.strip()
+    # the 5th value (note) is null if the text contains no such value
+    note = tokens["Note"]
+    tokens["Note"] = pc.if_else(pc.greater_equal(pc.count_substring(text, ";"), 4), note, null)
 
-    incorr_cond_qry = data.query("Condition.notna() and Condition.str.len() != 4")
-    incorr_categ_qry = data.query("Category.notna() and Category.str.len() != 2")
+    tokens = pa.table(tokens).to_pandas(types_mapper = _ARROW_DTYPES.get)
+    tokens.index = data.index
 
-    # replace incorrect extracted entries with nan
-    data.loc[incorr_cond_qry.index, "Condition"] = pd.NA
-    data.loc[incorr_categ_qry.index, "Category"] = pd.NA
+    # insert all the token fields at once
+    data = pd.concat([data, tokens], axis = 1, copy = False)
 
     # convert the extracted data to appropriate data types
-    data["Condition"] = data["Condition"].astype("category")
-    data["Category"] = data["Category"].astype("category")
-    data["Note"] = data["Note"].astype("string")
+    data = data.astype({
+        "Condition": "category",
+        "Category": "category",
+        "Note": "string[pyarrow]"
+    }, copy = False)
 
     data["Customer"] = pd.to_numeric(data["Customer"], errors = "coerce").astype("UInt32")
     data["Agreement"] = pd.to_numeric(data["Agreement"], errors = "coerce").astype("UInt32")
@@ -483,67 +699,91 @@ def read_binary_file(file_path: str) -> DataFrame:
     A DataFrame object containing the file data.
     """
 
-    _logger.debug(f"Reading file: '{file_path}'")
+    _logger.debug("Reading file: '%s'", file_path)
 
     if not file_path.endswith(".feather"):
         raise ValueError(f"Unsupported file type used: {file_path}")
 
-    data = pd.read_feather(file_path, use_threads = True)
-
-    if "fs10n" in file_path:
-        data["Cummulative_Balance"] = data["Cummulative_Balance"].apply(lambda x: pd.NA if x is None else x)
-        data["Balance"] = data["Balance"].apply(lambda x: pd.NA if x is None else x)
+    # string fields are read as arrow-backed strings that
+    # use pd.NA for nulls, so there's no None to replace
+    table = pa.feather.read_table(file_path, use_threads = True)
+    data = table.to_pandas(types_mapper = _ARROW_DTYPES.get)
 
     return data
 
-def read_textual_file(file_path: str) -> str:
+def read_textual_file(file_path: str) -> bytes:
     """
-    Reads the content of a textual file
-    stored in .txt or .dat format.
+    Reads the raw content of a textual
+    file stored in .txt or .dat format.
+    The content is returned undecoded
+    as utf-8 encoded bytes.
     """
 
-    _logger.debug(f"Reading file: '{file_path}'")
+    _logger.debug("Reading file: '%s'", file_path)
 
     if not file_path.endswith((".dat", ".txt")):
         raise ValueError(f"Unsupported file format: {file_path}")
 
-    with open(file_path, 'r', encoding = "utf-8") as stream:
+    with open(file_path, 'rb') as stream:
         txt = stream.read()
 
     return txt
 
-def _clean_text(txt: str, patt: str) -> str:
+def _clean_text(txt: bytes, patt: re.Pattern) -> bytes:
     """
     Removes irrelevant lines from file text.
     """
 
     # get all data lines containing accounting items
-    matches = re.findall(patt, txt, re.M)
-    replaced = list(map(lambda x: x[1:-1].strip(), matches))
-    preproc = "\n".join(replaced)
+    preproc = b"\n".join(m.group(1).strip() for m in patt.finditer(txt))
 
     return preproc
 
-def _parse_fbl3n_data(text: str, file_type: FileTypes, header: list,
-                      multiproc: bool) -> DataFrame:
+def _read_csv(text: bytes, sep: str, names: list = None,
+              column_types: dict = None, trim: bool = False) -> DataFrame:
     """
-    Parses a cleaned FBL5N text.
+    Reads delimited text into a DataFrame object
+    using the pyarrow csv reader. String fields
+    are returned as arrow-backed strings, with
+    leading and trailing whitespaces removed
+    if 'trim' is True.
     """
 
-    WORKER_COUNT = 5
-    MAX_ROWS_SNG = 1000
-    HEADER_ROW_IDX = 0
-    buff = StringIO(text)
+    table = pa.csv.read_csv(
+        pa.py_buffer(text),
+        read_options = pa.csv.ReadOptions(column_names = names),
+        parse_options = pa.csv.ParseOptions(delimiter = sep),
+        convert_options = pa.csv.ConvertOptions(
+            column_types = column_types,
+            strings_can_be_null = False
+        )
+    )
+
+    if trim:
+        # strip all string fields in a single pass over the table
+        table = pa.table([
+            pc.utf8_trim_whitespace(col) if col.type == pa.string() else col
+            for col in table.columns
+        ], names = table.column_names)
+
+    # each column is converted into its own block, so that the
+    # numeric columns are not copied into a consolidated 2D array
+    data = table.to_pandas(types_mapper = _ARROW_DTYPES.get, split_blocks = True)
+
+    return data
+
+def _read_fbl3n_data(text: bytes, file_type: FileTypes, header: list) -> DataFrame:
+    """
+    Reads a cleaned FBL5N text into a DataFrame object.
+    """
 
     if file_type == FileTypes.DAT:
-        data = pd.read_csv(buff,
-            sep = '\t', engine = "pyarrow",
-            header = HEADER_ROW_IDX, dtype = {
-                "Assignment": "string",
-                "Text": "string",
-                "Tx": "string",
-                "BusA": "string"
-            }
+        data = _read_csv(text, sep = '\t', column_types = {
+                "Assignment": pa.string(),
+                "Text": pa.string(),
+                "Tx": pa.string(),
+                "BusA": pa.string()
+            }, trim = True
         )
 
         data.drop("Crcy", axis = 1, inplace = True)
@@ -551,37 +791,108 @@ def _parse_fbl3n_data(text: str, file_type: FileTypes, header: list,
         data.columns = header
 
     elif file_type == FileTypes.TXT:
-        data = pd.read_csv(buff, names = header,
-            sep = '|', engine = "pyarrow", dtype = {
-                "Assignment": "string",
-                "Text": "string",
-                "Tax_Code": "string",
-                "Business_Area": "string"
-            }
+        data = _read_csv(text, sep = '|', names = header, column_types = {
+                "Assignment": pa.string(),
+                "Text": pa.string(),
+                "Tax_Code": pa.string(),
+                "Business_Area": pa.string()
+            }, trim = True
+        )
+
+    return data
+
+def _parse_fbl3n_chunk(text: bytes, file_type: FileTypes, header: list) -> DataFrame:
+    """
+    Reads and parses a part of a cleaned FBL5N text.
+    """
+
+    data = _read_fbl3n_data(text, file_type, header)
+    parsed = _parse_data(data)
+
+    # each chunk encodes its own categories, so that the
+    # values are hashed only once, inside of the workers
+    parsed = parsed.astype({col: "category" for col in _FBL3N_CATEG_FIELDS}, copy = False)
+
+    return parsed
+
+def _combine_fbl3n_chunks(chunks: list, categorical: tuple) -> DataFrame:
+    """
+    Combines parsed FBL3N data chunks into
+    a single DataFrame object while keeping
+    the categorical fields categorical.
+    """
+
+    # concatenating categoricals with differing categories yields
+    # object fields, so the categories are merged separately; this
+    # only recodes the chunk codes instead of rehashing all the values
+    combined = pd.concat([
+        chunk.drop(columns = list(categorical))
+        for chunk in chunks
+    ], ignore_index = True, copy = False)
+
+    for col in categorical:
+        combined[col] = union_categoricals(
+            [chunk[col] for chunk in chunks],
+            sort_categories = True
         )
 
-    if data.shape[0] <= MAX_ROWS_SNG or not multiproc:
+    # restore the original field order
+    combined = combined.reindex(columns = chunks[0].columns, copy = False)
+
+    return combined
+
+def _parse_fbl3n_data(text: bytes, file_type: FileTypes, header: list,
+                      multiproc: bool) -> DataFrame:
+    """
+    Parses a cleaned FBL5N text.
+    """
+
+    WORKER_COUNT = 5
+    MAX_ROWS_SNG = 1000
+
+    if text.count(b"\n") <= MAX_ROWS_SNG or not multiproc:
+        data = _read_fbl3n_data(text, file_type, header)
         _logger.debug("Parsing data ...")
         try:
             parsed = _parse_data(data)
         except Exception as exc:
             _logger.exception(exc)
             return None
+
+        parsed = parsed.astype({col: "category" for col in _FBL3N_CATEG_FIELDS}, copy = False)
     else:
 
-        # split data into smaller manageable chunks
-        _logger.debug(f"Splitting data into {WORKER_COUNT} chunks ...")
-        data_chunks = np.array_split(data, WORKER_COUNT)
+        lines = text.splitlines()
+
+        # .dat files contain a header row which
+        # needs to be placed at the top of each chunk
+        col_names = lines.pop(0) + b"\n" if file_type == FileTypes.DAT else b""
+
+        # split text into smaller manageable chunks; each chunk is read
+        # by its own worker, so that the workers share no data buffers
+        _logger.debug("Splitting data into %d chunks ...", WORKER_COUNT)
+        chunk_size = -(-len(lines) // WORKER_COUNT)
+        text_chunks = [
+            col_names + b"\n".join(lines[idx:idx + chunk_size])
+            for idx in range(0, len(lines), chunk_size)
+        ]
+
+        del lines
 
-        # init pool of workers and let them process the data chunks
-        _logger.debug(f"Creating {WORKER_COUNT} parsing workers ...")
-        with Pool(WORKER_COUNT) as data_pool:
+        # init pool of threads and let them process the text chunks;
+        # unlike worker processes, threads use the text chunks
+        # directly, so the data doesn't need to be pickled and unpickled
+        _logger.debug("Creating %d parsing workers ...", WORKER_COUNT)
+        with ThreadPoolExecutor(WORKER_COUNT) as executor:
             _logger.debug("Parsing data ...")
-            parsed = data_pool.map(_parse_data, data_chunks)
+            parsed = list(executor.map(
+                _parse_fbl3n_chunk, text_chunks,
+                repeat(file_type), repeat(header)
+            ))
 
         # combine the data parts returned by workers
         _logger.debug("Concatenating data chunks ...")
-        parsed = pd.concat(parsed)
+        parsed = _combine_fbl3n_chunks(parsed, _FBL3N_CATEG_FIELDS)
 
     return parsed
 
@@ -596,7 +907,7 @@ def convert_fbl3n_data(file_path: str, multiproc: bool = True) -> DataFrame:
         Path to the file containing exported FBL3N data.
 
     multiproc:
-        Indicates whether multiprocessing should be used to convert data.
+        Indicates whether the data should be converted in parallel threads.
 
     Returns:
     --------
@@ -609,7 +920,7 @@ def convert_fbl3n_data(file_path: str, multiproc: bool = True) -> DataFrame:
 
     if file_path.endswith(".txt"):
         file_type = FileTypes.TXT
-        text = _clean_text(content, patt = r"^\|\s+\d{4}\|.*$")
+        text = _clean_text(content, patt = _FBL3N_ITEM_RE)
     elif file_path.endswith(".dat"):
         file_type = FileTypes.DAT
         text = content
@@ -625,52 +936,24 @@ def convert_fbl3n_data(file_path: str, multiproc: bool = True) -> DataFrame:
     if parsed.empty:
         return None
 
-    # text might contain floats as a result of reading
-    # files without explicitly specified dtypes
+    # text might contain floats as a result of reading files without
+    # explicitly specified dtypes; the categorical fields are already
+    # encoded by the parsing workers, so their categories are checked
     assert infer_dtype(parsed["Text"]) == "string"
-    assert infer_dtype(parsed["Assignment"]) == "string"
-    assert infer_dtype(parsed["Tax_Code"]) == "string"
-    assert infer_dtype(parsed["Business_Area"]) == "string"
-
-    # check & reset data index
-    if parsed.index.has_duplicates:
-        parsed.reset_index(inplace = True, drop = True)
-
-    categorical = (
-        "Document_Type",
-        "Condition",
-        "Category",
-        "Posting_Key",
-        "Assignment",
-        "Business_Area",
-        "Tax_Code"
-    )
-
-    # finally, convert the respective data fields to (or back to)
-    # categories. This is needed particularly following data concatenation
-    _logger.debug(f"Converting the following data fields to categorical: {'; '.join(categorical)}'")
-    for col in categorical:
-        parsed[col] = parsed[col].astype("category")
+    assert infer_dtype(parsed["Assignment"].cat.categories) == "string"
+    assert infer_dtype(parsed["Tax_Code"].cat.categories) == "string"
+    assert infer_dtype(parsed["Business_Area"].cat.categories) == "string"
 
     # validate extracted categories by comparing
-    # the values with teh list of official categs
-    categs = (
-        "B1", "B2", "B3", "B4",
-        "B5", "B6", "B7", "B8",
-        "BO", "C1", "C2", "C3",
-        "D1", "DS", "E1", "EM",
-        "FE", "FS", "S1", "SE",
-        "YJ", "EU", "GR"
-    )
+    # the values with the set of official categs
+    undef_cats = set(parsed["Category"].cat.categories) - _VALID_CATEGS
 
-    if not parsed["Category"].cat.categories.isin(categs).all():
-        undef_cats = set(parsed['Category'].cat.categories) - set(categs)
-        _logger.warning(f"Undefined categories found: {', '.join(undef_cats)}",)
+    if len(undef_cats) != 0:
+        _logger.warning("Undefined categories found: %s", _LazyJoin(", ", undef_cats))
 
     # ensure all amounts with pstkey = 50 are negative
     # since .dat files store LC amounts as absolute vals
-    mask = ((parsed["Posting_Key"] == 50) & (parsed["LC_Amount"] > 0))
-    parsed.loc[mask, "LC_Amount"] = -1 * parsed.loc[mask, "LC_Amount"]
+    parsed["LC_Amount"] = _sign_credit_amounts(parsed)
 
     # resetting index will remove any duplicated index vals
     # as a result of data concatenation
@@ -683,8 +966,8 @@ def convert_fbl3n_data(file_path: str, multiproc: bool = True) -> DataFrame:
     assert parsed["Customer"].dtype == "UInt32"
     assert parsed["Agreement"].dtype == "UInt32"
     assert parsed["Period"].dtype == "UInt8"
-    assert parsed["Document_Number"].dtype == "Int64"
-    assert parsed["Clearing_Document"].dtype == "Int64"
+    assert parsed["Document_Number"].dtype.kind == "u"
+    assert parsed["Clearing_Document"].dtype.kind == "u"
     assert parsed["LC_Amount"].dtype == "float64"
     assert parsed["Text"].dtype == "string"
     assert parsed["Assignment"].dtype == "category"
@@ -723,22 +1006,22 @@ def convert_se16_kote(file_path: str) -> DataFrame:
     _logger.info("Converting 'KOTE890' data ...")
 
     raw_txt = read_textual_file(file_path)
-    prep_txt = _clean_text(raw_txt, patt = r"^\|\s*\d{3}\|.*\|$")
+    prep_txt = _clean_text(raw_txt, patt = _SE16_ITEM_RE)
 
-    parsed = pd.read_csv(StringIO(prep_txt),
+    parsed = _read_csv(prep_txt,
         sep = '|',
-        names = _SE16_KOTE_HEADER,
-        keep_default_na = False,
-        dtype = {
-            "Agreement": "UInt32",
-            "Condition_Record_Number": "UInt32",
-            "Client": "string",
-            "Application": "string",
-            "Condition_Type": "string",
-            "Sales_Organization": "string",
-            "Sales_Office": "string",
-            "Customer": "string"
-        }
+        names = list(_SE16_KOTE_HEADER),
+        column_types = {
+            "Agreement": pa.uint32(),
+            "Condition_Record_Number": pa.uint32(),
+            "Client": pa.string(),
+            "Application": pa.string(),
+            "Condition_Type": pa.string(),
+            "Sales_Organization": pa.string(),
+            "Sales_Office": pa.string(),
+            "Customer": pa.string()
+        },
+        trim = True
     )
 
     # if parsed correctly, the resulting data will not be empty
@@ -753,10 +1036,7 @@ def convert_se16_kote(file_path: str) -> DataFrame:
         "Sales_Organization"
     )
 
-    # remove leading and trailing whitespaces from the string data
-    for col in categorical:
-        parsed[col] = parsed[col].str.strip()
-        parsed[col] = parsed[col].astype("category")
+    parsed = parsed.astype({col: "category" for col in categorical}, copy = False)
 
     # parse date fields
     parsed["Valid_To"] = _parse_dates(parsed["Valid_To"])
@@ -816,16 +1096,16 @@ def convert_se16_kona(file_path: str) -> DataFrame:
 
     raw_txt = read_textual_file(file_path)
 
-    prep_txt = _clean_text(raw_txt, patt = r"^\|\s*\d{3}\|.*\|$")
-    prep_txt = prep_txt.replace("CARAT-Direktbonus|Hengstenberg GmbH", "CARAT-Direktbonus/Hengstenberg GmbH")
-    prep_txt = prep_txt.replace("Umsatzziel- oder Wachstumsbonus|LEJ GmbH", "Umsatzziel- oder Wachstumsbonus/LEJ GmbH")
+    prep_txt = _clean_text(raw_txt, patt = _SE16_ITEM_RE)
+    prep_txt = prep_txt.replace(b"CARAT-Direktbonus|Hengstenberg GmbH", b"CARAT-Direktbonus/Hengstenberg GmbH")
+    prep_txt = prep_txt.replace(b"Umsatzziel- oder Wachstumsbonus|LEJ GmbH", b"Umsatzziel- oder Wachstumsbonus/LEJ GmbH")
 
     # parse the text data
-    parsed = pd.read_csv(StringIO(prep_txt),
+    parsed = _read_csv(prep_txt,
         sep = '|',
-        names = _SE16_KONA_HEADER,
-        dtype = "string",
-        keep_default_na = False
+        names = list(_SE16_KONA_HEADER),
+        column_types = dict.fromkeys(_SE16_KONA_HEADER, pa.string()),
+        trim = True
     )
 
     parsed = parsed[cols_to_use]
@@ -833,16 +1113,10 @@ def convert_se16_kona(file_path: str) -> DataFrame:
     # if parsed correctly, the resulting data will not be empty
     assert not parsed.empty, "Parsing failed!"
 
-    # remove leading and trailing whitespaces from the string data
-    for col in parsed.columns:
-        parsed[col] = parsed[col].str.strip()
-
     # parse and convert date fields
     # skip parsing of the 'Rebate_Recipient' field as some vals (Germany) are not numeric
-    parsed["Valid_To"] = _parse_dates(parsed["Valid_To"])
-    parsed["Valid_From"] = _parse_dates(parsed["Valid_From"])
-    parsed["Created_On"] = _parse_dates(parsed["Created_On"])
-    parsed["Changed_On"] = _parse_dates(parsed["Changed_On"])
+    date_cols = ("Valid_To", "Valid_From", "Created_On", "Changed_On")
+    parsed = parsed.assign(**{col: _parse_dates(parsed[col]) for col in date_cols})
     parsed["Agreement"] = parsed["Agreement"].astype("UInt32")
     parsed["Addition_Value_Days"] = pd.to_numeric(parsed["Addition_Value_Days"]).astype("UInt32")
     parsed["Predecessor"] = pd.to_numeric(parsed["Predecessor"]).astype("UInt32")
@@ -868,8 +1142,7 @@ def convert_se16_kona(file_path: str) -> DataFrame:
         "Settlement_Periods"
     )
 
-    for col in categ_cols:
-        parsed[col] = parsed[col].astype("category")
+    parsed = parsed.astype({col: "category" for col in categ_cols}, copy = False)
 
     return parsed
 
@@ -891,47 +1164,40 @@ def convert_zsd25_loc_data(file_path: str) -> tuple:
     _logger.info("Converting ZSD25 local entity bonus data ...")
 
     raw_txt = read_textual_file(file_path)
-    prep_txt = _clean_text(raw_txt, patt = r"^\|\s?\d{8}\s?\|.*\|$")
+    prep_txt = _clean_text(raw_txt, patt = _ZSD25_ITEM_RE)
 
-    parsed = pd.read_csv(
-        StringIO(prep_txt),
+    parsed = _read_csv(prep_txt,
         sep = '|',
-        names = _ZSD25_HEADER,
-        dtype = "string",
-        keep_default_na = False
+        names = list(_ZSD25_HEADER),
+        column_types = dict.fromkeys(_ZSD25_HEADER, pa.string()),
+        trim = True
     )
 
-    for col in parsed.columns:
-        parsed[col] = parsed[col].str.strip()
-
-    parsed.loc[(parsed["Name"] == ""), "Name"] = pd.NA
+    parsed["Name"] = parsed["Name"].mask(parsed["Name"] == "", pd.NA)
     parsed["Agreement"] = pd.to_numeric(parsed["Agreement"])
-    parsed["Status"] = parsed["Status"].astype("category")
-    parsed["Agreement_Type_Code"] = parsed["Agreement_Type_Code"].astype("category")
-    parsed["Payments"] = _parse_amounts(parsed["Payments"])
-    parsed["Open_Accruals"] = _parse_amounts(parsed["Open_Accruals"])
-    parsed["Accruals_Reversed"] = _parse_amounts(parsed["Accruals_Reversed"])
-    parsed["Accruals"] = _parse_amounts(parsed["Accruals"])
-    parsed["Open_Value"] = _parse_amounts(parsed["Open_Value"])
-    parsed["Condition_Based_Value"] = _parse_amounts(parsed["Condition_Based_Value"])
-    parsed["Condition_Value"] = _parse_amounts(parsed["Condition_Value"])
+    parsed = parsed.astype({"Status": "category", "Agreement_Type_Code": "category"}, copy = False)
+    parsed = parsed.assign(**_parse_amounts_batch(parsed, [
+        "Payments", "Open_Accruals", "Accruals_Reversed", "Accruals",
+        "Open_Value", "Condition_Based_Value", "Condition_Value"
+    ]))
     parsed["Valid_From"] = _parse_dates(parsed["Valid_From"])
     parsed["Valid_To"] = _parse_dates(parsed["Valid_To"])
 
     # Germany: some vals are non-numeric, these will be converted separately
-    if parsed["Rebate_Recipient"].str.isnumeric().all():
-        parsed["Rebate_Recipient"] = pd.to_numeric(parsed["Rebate_Recipient"]).astype("UInt32")
+    parsed["Rebate_Recipient"] = _parse_recipients(parsed["Rebate_Recipient"])
 
     # clean and parse 'Condition rate' column before any further manipulation
-    cleaned_cond_rate = parsed["Condition_Rate"].str.replace(r"\s+\%", "", regex = True)
-    parsed["Condition_Rate"] = _parse_amounts(cleaned_cond_rate)
+    parsed["Condition_Rate"] = _parse_rates(parsed["Condition_Rate"])
 
-    parsed_conds = parsed.copy()
+    # the full parsed dataset is kept as conditions data; the steps
+    # below only derive new frames from it and never modify it in place,
+    # so the same object is returned instead of a deep copy of all fields
+    parsed_conds = parsed
 
     # save data subset containing agreement number (key) and Condition rate (value)
     # for later joining with the data from which redundant rows were removed
     mask = parsed["Condition_Rate"].notna()
-    agree_to_cond_rate = parsed[mask][["Agreement", "Condition_Rate"]].drop_duplicates()
+    agree_to_cond_rate = parsed.loc[mask, ["Agreement", "Condition_Rate"]].drop_duplicates()
 
     # replace empty strings with NA in column 'Country'
     # to facilitate identifying redundant rows to drop
@@ -940,7 +1206,16 @@ def convert_zsd25_loc_data(file_path: str) -> tuple:
 
     # join the 'Conditional rate' values from the saved subset
     # with the cleaned dataset based on 'Agreement' numbers
-    joined = dropped.merge(agree_to_cond_rate, on = "Agreement", how = "left")
+    if agree_to_cond_rate["Agreement"].is_unique:
+        # a single rate per agreement allows for a plain hash
+        # lookup per row instead of building a full join
+        cond_rates = agree_to_cond_rate.set_index("Agreement")["Condition_Rate"]
+        joined = dropped.assign(Condition_Rate = dropped["Agreement"].map(cond_rates))
+        joined.reset_index(inplace = True, drop = True)
+    else:
+        # agreements with multiple rates need a join
+        # which yields a separate row for each rate
+        joined = dropped.merge(agree_to_cond_rate, on = "Agreement", how = "left", sort = False, copy = False)
 
     # reorder fields so that the 'Condition rate'
     # appears at the same place as in head quarter data
@@ -981,40 +1256,31 @@ def convert_zsd25_glob_data(file_path: str, sales_org: str) -> DataFrame:
     _logger.info("Converting ZSD25 head quarter bonus data ...")
 
     raw_txt = read_textual_file(file_path)
-    prep_txt = _clean_text(raw_txt, patt = r"^\|\s?\d{8}\s?\|.*\|$")
+    prep_txt = _clean_text(raw_txt, patt = _ZSD25_ITEM_RE)
 
-    parsed = pd.read_csv(StringIO(prep_txt),
+    parsed = _read_csv(prep_txt,
         sep = "|",
-        names = _ZSD25_HEADER,
-        dtype = "string",
-        keep_default_na = False
+        names = list(_ZSD25_HEADER),
+        column_types = dict.fromkeys(_ZSD25_HEADER, pa.string()),
+        trim = True
     )
 
     assert not parsed.empty, "Parsing failed!"
 
-    for col in parsed.columns:
-        parsed[col] = parsed[col].str.strip()
-
     parsed["Agreement"] = pd.to_numeric(parsed["Agreement"]).astype("UInt32")
-    parsed["Status"] = parsed["Status"].astype("category")
-    parsed["Agreement_Type_Code"] = parsed["Agreement_Type_Code"].astype("category")
-    parsed["Condition_Based_Value"] = _parse_amounts(parsed["Condition_Based_Value"])
-    parsed["Payments"] = _parse_amounts(parsed["Payments"])
-    parsed["Open_Accruals"] = _parse_amounts(parsed["Open_Accruals"])
-    parsed["Accruals_Reversed"] = _parse_amounts(parsed["Accruals_Reversed"])
-    parsed["Accruals"] = _parse_amounts(parsed["Accruals"])
-    parsed["Open_Value"] = _parse_amounts(parsed["Open_Value"])
-    parsed["Condition_Value"] = _parse_amounts(parsed["Condition_Value"])
+    parsed = parsed.astype({"Status": "category", "Agreement_Type_Code": "category"}, copy = False)
+    parsed = parsed.assign(**_parse_amounts_batch(parsed, [
+        "Condition_Based_Value", "Payments", "Open_Accruals",
+        "Accruals_Reversed", "Accruals", "Open_Value", "Condition_Value"
+    ]))
     parsed["Valid_From"] = _parse_dates(parsed["Valid_From"])
     parsed["Valid_To"] = _parse_dates(parsed["Valid_To"])
 
     # Germany: some vals are non-numeric, these will be converted separately
-    if parsed["Rebate_Recipient"].str.isnumeric().all():
-        parsed["Rebate_Recipient"] = pd.to_numeric(parsed["Rebate_Recipient"]).astype("UInt32")
+    parsed["Rebate_Recipient"] = _parse_recipients(parsed["Rebate_Recipient"])
 
     # clean and parse 'Condition rate' column before any further manipulation
-    cleaned_cond_rate = parsed["Condition_Rate"].str.replace(r"\s+\%", "", regex = True)
-    parsed["Condition_Rate"] = _parse_amounts(cleaned_cond_rate)
+    parsed["Condition_Rate"] = _parse_rates(parsed["Condition_Rate"])
 
     # remove rows with empty valid data or open accruals
     cleaned = parsed.drop(index = parsed.query("Open_Accruals.isna()").index)
@@ -1024,7 +1290,7 @@ def convert_zsd25_glob_data(file_path: str, sales_org: str) -> DataFrame:
 
     # indicate local sales organization where text is missing
     mask = (cleaned["Variable_Key"] == "")
-    cleaned.loc[mask, "Variable_Key"] = f"For {sales_org}"
+    cleaned["Variable_Key"] = cleaned["Variable_Key"].mask(mask, f"For {sales_org}")
 
     return cleaned
 
@@ -1043,24 +1309,23 @@ def convert_fs10n_data(file_path: str) -> DataFrame:
     """
 
     raw_txt = read_textual_file(file_path)
-    _logger.debug(f"FS10N raw data:\n{raw_txt}")
-    prep_txt = _clean_text(raw_txt, r"\|[\d,T].*\|")
+
+    if _logger.isEnabledFor(logging.DEBUG):
+        _logger.debug("FS10N raw data:\n%s", raw_txt.decode("utf-8"))
+
+    prep_txt = _clean_text(raw_txt, _FS10N_ITEM_RE)
 
     # parse the text data
-    parsed = pd.read_csv(StringIO(prep_txt),
+    parsed = _read_csv(prep_txt,
         sep = "|",
-        names = _FS10N_HEADER,
-        dtype = "string",
-        keep_default_na = False
+        names = list(_FS10N_HEADER),
+        column_types = dict.fromkeys(_FS10N_HEADER, pa.string()),
+        trim = True
     )
 
-    for col in parsed.columns:
-        parsed[col] = parsed[col].str.strip()
-
-    parsed["Debit"] = _parse_amounts(parsed["Debit"])
-    parsed["Credit"] = _parse_amounts(parsed["Credit"])
-    parsed["Balance"] = _parse_amounts(parsed["Balance"])
-    parsed["Cummulative_Balance"] = _parse_amounts(parsed["Cummulative_Balance"])
+    parsed = parsed.assign(**_parse_amounts_batch(
+        parsed, ["Debit", "Credit", "Balance", "Cummulative_Balance"]
+    ))
 
     # first and last data rows represent non-relevant data
     parsed.drop(index = parsed.index.max(), inplace = True)
@@ -1068,9 +1333,8 @@ def convert_fs10n_data(file_path: str) -> DataFrame:
     parsed["Period"] = np.arange(1, parsed.shape[0] + 1)
     parsed.set_index("Period", inplace=True)
 
-    for col in parsed:
-        parsed[col].fillna(pd.NA, inplace = True)
-
+    # all fields are float64, where missing amounts are
+    # already represented by nan, so no filling is needed
     return parsed
 
 def create_period_overview(yearly_data: DataFrame) -> DataFrame:
@@ -1096,17 +1360,50 @@ def create_period_overview(yearly_data: DataFrame) -> DataFrame:
         values = "LC_Amount",
         index = ["Fiscal_Year", "Period"],
         columns = "GL_Account",
-        aggfunc = np.sum,
+        aggfunc = "sum",
         margins = True,
         margins_name = "Grand Total",
-        dropna = True
+        dropna = True,
+        observed = True
     )
 
-    for col in pivotted.columns:
-        pivotted[col] = pivotted[col].astype("float64")
+    pivotted = pivotted.astype("float64", copy = False)
 
     return pivotted
 
+def _sum_text_amounts(txt_summs: dict) -> DataFrame:
+    """
+    Sums text amount subtotals of all GL accounts
+    on agreements into a single table where each
+    account is represented by a separate field.
+    """
+
+    # stack the subtotals of all accounts and sum them
+    # in one pass instead of grouping each account separately
+    combined = pd.concat([
+        txt_summ[["Agreement", "LC_Amount_Sum"]].assign(GL_Account = acc)
+        for acc, txt_summ in txt_summs.items()
+    ], ignore_index = True)
+
+    # make sure the summed amounts are held in a contiguous
+    # float array, so that the groupby takes its fast cython path
+    combined["LC_Amount_Sum"] = combined["LC_Amount_Sum"].astype("float64", copy = False)
+
+    summed = combined.groupby(
+        ["Agreement", "GL_Account"],
+        sort = False, observed = True
+    )["LC_Amount_Sum"].sum()
+
+    # agreements not booked on an account, as well as accounts with
+    # no agreement-related items at all (such accounts yield no column
+    # when unstacked), are zero-filled here already, so the looked up
+    # amounts never need a fill
+    summed = summed.unstack("GL_Account", fill_value = 0.0)
+    summed = summed.reindex(columns = list(txt_summs.keys()), fill_value = 0.0)
+    summed.columns.name = None
+
+    return summed
+
 def calculate_le_bonus_data(txt_summs: DataFrame, le_data: DataFrame, loc_curr: str, ex_rate: float) -> DataFrame:
     """
     Generates a local entity bonus data table that will be placed
@@ -1134,9 +1431,9 @@ def calculate_le_bonus_data(txt_summs: DataFrame, le_data: DataFrame, loc_curr:
 
     _logger.info("Performing data calculations for local entity bonuses ...")
 
-    data = le_data.copy()
-
-    data = data[[
+    # selecting the fields already creates a new object,
+    # so there's no need to copy the source data beforehand
+    data = le_data[[
         "Rebate_Recipient",
         "Name",
         "Country",
@@ -1169,23 +1466,21 @@ def calculate_le_bonus_data(txt_summs: DataFrame, le_data: DataFrame, loc_curr:
 
     subset["LC_Open_Accr"] = subset["Open_Accruals"] + subset["Corr_to_LC"]
 
-    for acc in txt_summs.keys():
+    gl_accs = list(txt_summs.keys())
 
-        txt_summ = txt_summs[acc].copy()
-        txt_summ = txt_summ[["Agreement", "LC_Amount_Sum"]]
-        summed = txt_summ.groupby("Agreement").sum().reset_index()
+    diff = np.zeros(subset.shape[0])
 
-        subset = subset.merge(summed,
-            left_on = "Agreement",
-            right_on = "Agreement",
-            how = "left",
-        )
+    if len(gl_accs) != 0:
+        # look up the summed amounts by agreement, agreements
+        # with no amount on any account get a zero right away
+        summed = _sum_text_amounts(txt_summs).reindex(subset["Agreement"], fill_value = 0.0)
 
-        subset.rename({"LC_Amount_Sum": acc}, inplace = True, axis = 1)
-        subset[acc] = subset[acc].fillna(0)
-        subset["Difference"] = subset["Difference"] + subset[acc]
+        for acc in gl_accs:
+            amounts = summed[acc].to_numpy()
+            subset[acc] = amounts
+            np.add(diff, amounts, out = diff)
 
-    subset["Difference"] = subset["Difference"] - subset["LC_Open_Accr"]
+    subset["Difference"] = diff - subset["LC_Open_Accr"]
     subset["Difference"] = subset["Difference"].round(2)
 
     return subset
@@ -1217,9 +1512,9 @@ def calculate_hq_bonus_data(txt_summs: dict, hq_data: DataFrame, loc_curr: str,
 
     _logger.info("Performing data calculations for head quarter bonuses ...")
 
-    subset = hq_data.copy()
-
-    subset = subset[[
+    # selecting the fields already creates a new object,
+    # so there's no need to copy the source data beforehand
+    subset = hq_data[[
         "Rebate_Recipient",
         "Name",
         "Country",
@@ -1248,41 +1543,40 @@ def calculate_hq_bonus_data(txt_summs: dict, hq_data: DataFrame, loc_curr: str,
         Difference = 0.0
     )
 
-    accr_sums = subset[["Agreement", "Open_Accruals"]].copy()
-    accr_sums = accr_sums.groupby("Agreement").sum()
+    # the sums are joined back on agreements, so
+    # the group keys don't need to be sorted
+    accr_sums = subset.groupby("Agreement", sort = False, observed = True)[["Open_Accruals"]].sum()
     accr_sums.rename({"Open_Accruals": "LC_Open_Accr"}, axis = 1, inplace = True)
 
-    subset = subset.merge(accr_sums, on = "Agreement")
+    # the grouped sums are a fresh object with unique keys, so the
+    # joined result can take over the blocks without a final copy
+    subset = subset.merge(accr_sums, on = "Agreement", copy = False)
     calc_mask = ~subset["Agreement"].duplicated()
     gl_accs = list(txt_summs.keys())
 
     if ex_rate != 1.0:
         # this should not be applicable for countries where local currency is other than EUR
-        _logger.warning(f"The local currency is {loc_curr}, an exchange rate {ex_rate} will be used for calculations!")
+        _logger.warning("The local currency is %s, an exchange rate %s will be used for calculations!", loc_curr, ex_rate)
         mask = ((subset["Currency"] != loc_curr) & calc_mask)
         subset.loc[mask, "Corr_to_LC"] = subset.loc[mask, "Open_Accruals"] * ex_rate - subset.loc[mask, "Open_Accruals"]
 
     subset.loc[calc_mask, "LC_Open_Accr"] = subset.loc[calc_mask, "LC_Open_Accr"] + subset.loc[calc_mask, "Corr_to_LC"]
 
-    for acc in gl_accs:
+    diff = np.zeros(subset.shape[0])
 
-        txt_summ = txt_summs[acc].copy()
-        txt_summ = txt_summ[["Agreement", "LC_Amount_Sum"]]
-        summed = txt_summ.groupby("Agreement").sum().reset_index()
+    if len(gl_accs) != 0:
+        # look up the summed amounts by agreement, agreements
+        # with no amount on any account get a zero right away
+        summed = _sum_text_amounts(txt_summs).reindex(subset["Agreement"], fill_value = 0.0)
 
-        subset = subset.merge(
-            summed,
-            left_on = "Agreement",
-            right_on = "Agreement",
-            how = "left"
-        )
+        for acc in gl_accs:
+            amounts = summed[acc].to_numpy()
+            subset[acc] = amounts
+            np.add(diff, amounts, out = diff)
 
-        subset.rename({"LC_Amount_Sum": acc}, inplace = True, axis = 1)
-        subset[acc] = subset[acc].fillna(0) # inplace = True) inplace nefunguje
-        subset.loc[calc_mask, "Difference"] = subset.loc[calc_mask, "Difference"] + subset.loc[calc_mask, acc]
-
-    subset.loc[calc_mask, "Difference"] = subset.loc[calc_mask, "Difference"] - subset.loc[calc_mask, "LC_Open_Accr"]
-    subset.loc[calc_mask, "Difference"] = subset.loc[calc_mask, "Difference"].round(2)
+    # the differences of the duplicated agreements are erased below
+    subset["Difference"] = diff - subset["LC_Open_Accr"]
+    subset["Difference"] = subset["Difference"].round(2)
 
     # clean up data
     subset.loc[~calc_mask, ["LC_Open_Accr", "Difference"] + gl_accs] = pd.NA
@@ -1318,33 +1612,45 @@ def check_agreement_states(txt_summs: dict, le_bon: DataFrame, hq_bon: DataFrame
 
     checked = {}
 
-    for acc in txt_summs.keys():
+    # the open agreements are the same for all accounts,
+    # hence the lookup index is created only once
+    open_agreements = pd.Index(le_bon["Agreement"].unique())
 
-        data = txt_summs[acc].assign(
-            Status = "",
-        )
+    if hq_bon is not None:
+        open_agreements = open_agreements.union(hq_bon["Agreement"].unique())
 
-        # mark non-zero amount items where identification
-        # params are missing due to incorrect textual format
-        qry = data.query(
-            "(Condition.isna() or Category.isna() "
-            "or Customer.isna() or Agreement.isna()) "
-            "and LC_Amount_Sum != 0"
-        )
+    if len(txt_summs) == 0:
+        return checked
+
+    # stack the subtotals of all accounts, so that
+    # the item states are evaluated in a single pass
+    id_cols = ["Condition", "Category", "Customer", "Agreement"]
+    stacked = pd.concat({
+        acc: txt_summ[id_cols + ["LC_Amount_Sum"]]
+        for acc, txt_summ in txt_summs.items()
+    })
+
+    non_zero = (stacked["LC_Amount_Sum"] != 0)
 
-        data.loc[qry.index, "Status"] = Marks.INVALD_TEXT_FMT.value
+    # mark non-zero amount items where identification
+    # params are missing due to incorrect textual format
+    invalid_mask = non_zero & stacked[id_cols].isna().any(axis = 1)
 
-        # identify agreements closed in ZSD25 but still open on GL accounts
-        open_agreements = list(le_bon["Agreement"].unique())
+    # identify agreements closed in ZSD25 but still open on GL accounts
+    closed_mask = non_zero & ~stacked["Agreement"].isin(open_agreements) & ~invalid_mask
 
-        if hq_bon is not None:
-            open_agreements += list(hq_bon["Agreement"].unique())
+    statuses = Series(np.select(
+        [invalid_mask.to_numpy(bool), closed_mask.to_numpy(bool, na_value = False)],
+        [Marks.INVALD_TEXT_FMT.value, Marks.AGREEMENT_CLOSED.value],
+        default = ""
+    ).astype(object), index = stacked.index)
 
-        qry = data.query(f"LC_Amount_Sum != 0 and Agreement not in {open_agreements} and Status != '{Marks.INVALD_TEXT_FMT.value}'")
-        data.loc[qry.index, "Status"] = Marks.AGREEMENT_CLOSED.value
+    del stacked
+
+    for acc in txt_summs.keys():
+        data = txt_summs[acc].assign(Status = statuses.xs(acc).to_numpy())
         sorted_data = data.sort_values("Status", ascending = False)
         sorted_data.reset_index(inplace = True)
-
         checked[acc] = sorted_data
 
     return checked
@@ -1383,7 +1689,7 @@ def summarize(txt_summs: dict, le_calcs: DataFrame, hq_calcs: DataFrame, gl_data
     _logger.info("Summarizing general ledger and subledger bonus data ...")
 
     gl_accs = list(map(str, accs))
-    fs10n = gl_data.copy()
+    fs10n = gl_data
     fields = {}
 
     for acc in gl_accs:
@@ -1413,22 +1719,25 @@ def summarize(txt_summs: dict, le_calcs: DataFrame, hq_calcs: DataFrame, gl_data
         if acc not in fs10n:
             data[acc] = 0.0
             _logger.debug(
-                f"Summarization for account {acc} skipped. "
-                f"Reason: No data available for the reconciled period: {period}.")
+                "Summarization for account %s skipped. "
+                "Reason: No data available for the reconciled period: %s.", acc, period)
             continue
 
         if fs10n[acc] is None:
             cumm_balance = 0
         else:
-            cumm_balance = fs10n[acc].loc[period, "Cummulative_Balance"]
+            cumm_balance = fs10n[acc].at[period, "Cummulative_Balance"]
             if pd.isna(cumm_balance):
                 cumm_balance = 0
 
         data.loc["Local_Entity_Bonuses", acc] = le_calcs[acc].sum()
         data.loc["HQ_Bonuses", acc] = hq_calcs[acc].sum() if hq_calcs is not None else 0
         data.loc["GL_Balance", acc] = cumm_balance
-        data.loc["Status:_x", acc] = txt_summs[acc].query(f"Status == '{Marks.INVALD_TEXT_FMT.value}'")["LC_Amount_Sum"].sum()
-        data.loc["Status:_CHECK", acc] = txt_summs[acc].query(f"Status == '{Marks.AGREEMENT_CLOSED.value}'")["LC_Amount_Sum"].sum()
+
+        # sum amounts of all status flags at once instead of querying each flag
+        status_sums = txt_summs[acc].groupby("Status", sort = False)["LC_Amount_Sum"].sum()
+        data.loc["Status:_x", acc] = status_sums.get(Marks.INVALD_TEXT_FMT.value, 0.0)
+        data.loc["Status:_CHECK", acc] = status_sums.get(Marks.AGREEMENT_CLOSED.value, 0.0)
 
     data.loc["Local_Entity_Bonuses", "Difference"] = le_calcs["Difference"].sum()
     data.loc["HQ_Bonuses", "Difference"] = hq_calcs["Difference"].sum() if hq_calcs is not None else pd.NA
@@ -1438,10 +1747,14 @@ def summarize(txt_summs: dict, le_calcs: DataFrame, hq_calcs: DataFrame, gl_data
     data.loc["Status:_x", "Difference"] = data.loc["Status:_x", gl_accs].sum()
     data.loc["Status:_CHECK", "Difference"] = data.loc["Status:_CHECK", gl_accs].sum()
 
-    # rounding after summarization
-    for col in data.columns:
-        mask = data[col].notna()
-        data.loc[mask, col] = data.loc[mask, col].astype("float64").round(2)
+    # rounding after summarization; all the fields are rounded at once
+    # and the rounded vals are written back only where a value exists,
+    # fields that contain no missing values are stored as plain floats
+    rounded = data.fillna(np.nan).astype("float64").round(2)
+    complete = data.columns[data.notna().all()]
+
+    data = data.mask(data.notna(), rounded)
+    data = data.assign(**rounded[complete])
 
     data.reset_index(inplace = True)
     data["Summary"] = data["Summary"].str.replace("_", " ", regex = False)
@@ -1498,7 +1811,7 @@ def compile_recon_info(cntry: str, cocd: str, exch_rate: float, curr: str, fisc_
 
     assert 1 <= period < 15, "Argument 'period' has incorrect value!"
 
-    data = DataFrame.from_dict({
+    fields = {
         "Country": cntry,
         "Company_code": cocd,
         "Exchange_rate": exch_rate,
@@ -1511,85 +1824,36 @@ def compile_recon_info(cntry: str, cocd: str, exch_rate: float, curr: str, fisc_
         "Sales_organization_local": sal_org_le,
         "Date": recon_date,
         "Time": recon_time
-        },
-        orient = "index"
-    )
-
-    data[0] = data[0].apply(lambda x: x if type(x) is list else [x])
-
-    data = data.apply(
-        lambda x: Series(x[0]), axis = 1, result_type = "expand"
-    )
-
-    data.loc["Exchange_rate", :] = pd.to_numeric(data.loc["Exchange_rate", :]).astype("float32")
-    data.loc["Period", :] = pd.to_numeric(data.loc["Period", :]).astype("UInt8")
-    data.loc["Fiscal_year", :] = pd.to_numeric(data.loc["Fiscal_year", :]).astype("UInt16")
-    data.loc["GL_accounts", :] = pd.to_numeric(data.loc["GL_accounts", :]).astype("UInt64")
-    data.loc["Sales_offices", :] = data.loc["Sales_offices", :].astype("category")
-    data.loc["Sales_organization_global", :] = data.loc["Sales_organization_global", :].astype("category")
-    data.loc["Sales_organization_local", :] = data.loc["Sales_organization_local", :].astype("category")
+    }
 
-    data.fillna(pd.NA, inplace = True)
-
-    return data
-
-def _get_status_msg(hq_ageem: int, le_agreems: Series) -> str:
-    """
-    Generates 'Status' text associated with agreements.
-    """
-
-    if hq_ageem is pd.NA:
-        msg = "no match"
-    elif hq_ageem in tuple(le_agreems.dropna()):
-        msg = f"Is in HQ and Local Agreements. Agreement Nr. {hq_ageem}"
-    else:
-        msg = f"Is in HQ Agreements only. Agreement Nr. {hq_ageem}"
-
-    return msg
-
-def _get_difference_hq_status(le_diff: float, le_agreem: int, hq_agreems: Series) -> Any:
-    """
-    Generates 'HQ Diff' value associated with agreements.
-    """
+    numeric = {
+        "Exchange_rate": "float32",
+        "Period": "UInt8",
+        "Fiscal_year": "UInt16",
+        "GL_accounts": "UInt64"
+    }
 
-    if le_agreem is pd.NA:
-        stat = ""
-    elif le_agreem in tuple(hq_agreems.dropna()):
-        stat = le_diff
-    else:
-        stat = f"Agreement Nr. {le_agreem} is just in local overview."
+    # each field is placed onto a separate row, so the values are
+    # normalized to lists and the numeric ones are validated by
+    # casting to their dtypes before the rows are assembled,
+    # rather than converting each row of the table in place
+    rows = {}
 
-    return stat
+    for name, val in fields.items():
 
-def _get_overview_val(le_agreem: int, hq_agreems: Series, le_agreems: Series) -> str:
-    """
-    Generates 'Overview' text associated with agreements.
-    """
+        vals = val if isinstance(val, list) else [val]
 
-    if le_agreem is pd.NA:
-        val = ""
-    elif le_agreem in tuple(hq_agreems.dropna()) and le_agreem in tuple(le_agreems.dropna()):
-        val = "HQ and Local"
-    elif le_agreem in tuple(le_agreems.dropna()) and not le_agreem in tuple(hq_agreems.dropna()):
-        val = "In Local Overview"
-    else:
-        val = "In HQ overview"
+        if name in numeric:
+            vals = pd.to_numeric(Series(vals, dtype = object)).astype(numeric[name])
+            vals = vals.astype(object).tolist()
 
-    return val
+        rows[name] = vals
 
-def _get_amount_compared_val(le_diff: float, hq_diff: float) -> Any:
-    """
-    Generates 'Amount Compared' value associated with agreements.
-    """
+    data = DataFrame.from_dict(rows, orient = "index")
 
-    if le_diff is pd.NA or hq_diff is pd.NA:
-        val = ""
-    elif not str(hq_diff).isnumeric():
-        val = 'X'
-    else:
-        val = hq_diff - le_diff
+    data.fillna(pd.NA, inplace = True)
 
-    return val
+    return data
 
 def consolidate_zsd25_data(le_calcs: DataFrame, hq_calcs: DataFrame) -> tuple:
     """
@@ -1632,17 +1896,18 @@ def consolidate_zsd25_data(le_calcs: DataFrame, hq_calcs: DataFrame) -> tuple:
 
     # remove all agreements from le bonus calcs
     # that are also located in hq bonus calcs
-    dual_vals = le_calcs["Agreement"].apply(
-        lambda x: x in glob_bon_agreems
-    )
+    dual_vals = le_calcs["Agreement"].isin(glob_bon_agreems)
+    deduped = le_calcs.loc[~dual_vals].reset_index(drop = True)
 
-    idx = dual_vals[dual_vals == True].index
-    deduped = le_calcs.drop(index = idx)
-    deduped.reset_index(inplace = True, drop = True)
+    # generate 'Status' texts associated with the agreements
+    hq_agreems = hq_compare["HQ_Agreements"]
+    hq_agreem_nums = hq_agreems.astype("string").to_numpy(object)
 
     hq_compare = hq_compare.assign(
-        Overview = hq_compare.apply(
-            lambda x: _get_status_msg(x["HQ_Agreements"], hq_compare["LE_Agreements"]), axis = 1
+        Overview = np.select(
+            [hq_agreems.isna().to_numpy(), hq_agreems.isin(loc_bon_agreems).to_numpy(bool, na_value = False)],
+            ["no match", "Is in HQ and Local Agreements. Agreement Nr. " + hq_agreem_nums],
+            default = "Is in HQ Agreements only. Agreement Nr. " + hq_agreem_nums
         )
     )
 
@@ -1664,25 +1929,44 @@ def consolidate_zsd25_data(le_calcs: DataFrame, hq_calcs: DataFrame) -> tuple:
     local_compare.loc[:loc_calc_row_count - 1, "LE_Agreem"] = le_calcs["Agreement"]
     local_compare.loc[:glob_calc_row_count -1, "HQ_Agreem"] = hq_calcs["Agreement"]
 
-    local_compare["LE_Diff"].fillna(pd.NA, inplace = True)
-    local_compare["LE_Agreem"].fillna(pd.NA, inplace = True)
-    local_compare["HQ_Agreem"].fillna(pd.NA, inplace = True)
+    # unlike fillna(), mask() doesn't downcast the object fields
+    local_compare = local_compare.mask(local_compare.isna(), pd.NA)
+
+    le_agreem = local_compare["LE_Agreem"]
+    no_le_agreem = le_agreem.isna().to_numpy()
+    in_hq = le_agreem.isin(local_compare["HQ_Agreem"].dropna()).to_numpy()
+    in_le = le_agreem.isin(local_compare["LE_Agreem"].dropna()).to_numpy()
+    le_agreem_nums = le_agreem.astype("string").to_numpy(object)
 
+    # generate 'HQ Diff' and 'Overview' values associated with the agreements
     local_compare = local_compare.assign(
 
-        HQ_Diff = local_compare.apply(
-            lambda x: _get_difference_hq_status(x["LE_Diff"], x["LE_Agreem"], local_compare["HQ_Agreem"]), axis = 1
+        HQ_Diff = np.select(
+            [no_le_agreem, in_hq],
+            ["", local_compare["LE_Diff"].to_numpy(object)],
+            default = "Agreement Nr. " + le_agreem_nums + " is just in local overview."
         ),
 
-        Overview = local_compare.apply(
-            lambda x: _get_overview_val(x["LE_Agreem"], local_compare["HQ_Agreem"], local_compare["LE_Agreem"]), axis = 1
-        ),
+        Overview = np.select(
+            [no_le_agreem, in_hq & in_le, in_le & ~in_hq],
+            ["", "HQ and Local", "In Local Overview"],
+            default = "In HQ overview"
+        ).astype(object),
 
     )
 
+    # generate 'Amount Compared' values, where only
+    # the numeric 'HQ Diff' values are compared
+    le_diff = local_compare["LE_Diff"]
+    hq_diff = local_compare["HQ_Diff"]
+    hq_diff_numeric = hq_diff.astype(str).str.isnumeric().to_numpy()
+    compared = pd.to_numeric(hq_diff, errors = "coerce") - pd.to_numeric(le_diff, errors = "coerce")
+
     local_compare = local_compare.assign(
-        Amount_Compared = local_compare.apply(
-            lambda x: _get_amount_compared_val(x["LE_Diff"], x["HQ_Diff"]), axis = 1
+        Amount_Compared = np.select(
+            [(le_diff.isna() | hq_diff.isna()).to_numpy(), ~hq_diff_numeric],
+            ["", "X"],
+            default = compared.to_numpy(object)
         )
     )
 
@@ -1737,21 +2021,19 @@ def store_to_binary(data: DataFrame, file_path: str) -> None:
     reset = data.reset_index(drop = True)
     reset.columns = [str(col) for col in reset.columns]
 
-    _logger.debug(f"Dumping data to file: '{file_path}'")
-    reset.to_feather(file_path)
+    # the data contains many repeated values, which zstd compresses
+    # well at a low cost; the data is written in chunks of rows
+    _logger.debug("Dumping data to file: '%s'", file_path)
+    reset.to_feather(file_path, compression = "zstd", compression_level = 3, chunksize = 65536)
 
-def _clean_text_opt(txt: list, patt: str) -> str:
+def _clean_text_opt(txt: list, patt: re.Pattern) -> bytes:
     """
     Removes irrelevant lines from text.
     """
 
-    # get all data lines containing accounting items
-    # delete unused objects manually in case of a GC miss
-    matches = re.findall(patt, txt[0], re.M)
-    replaced = list(map(lambda x: x[1:-1].strip(), matches))
-    del matches
-    cleaned = "\n".join(replaced)
-    del replaced
+    # get all data lines containing accounting items; the matches
+    # are consumed lazily, so no intermediate lists are created
+    cleaned = b"\n".join(m.group(1).strip() for m in patt.finditer(txt[0]))
 
     return cleaned
 
@@ -1764,10 +2046,10 @@ def _parse_data_opt(data: DataFrame) -> DataFrame:
 
     # replace empty strings with null indicating either unused or missing
     # (possibly as a result of a mistake during item posting) field values
-    data.loc[(data["Text"] == ""), "Text"] = pd.NA                    # missing val
-    data.loc[(data["Assignment"] == ""), "Assignment"] = pd.NA        # missing val
-    data.loc[(data["Tax_Code"] == ""), "Tax_Code"] = pd.NA            # unused val
-    data.loc[(data["Business_Area"] == ""), "Business_Area"] = pd.NA  # unused val
+    data["Text"] = data["Text"].mask(data["Text"] == "")                            # missing val
+    data["Assignment"] = data["Assignment"].mask(data["Assignment"] == "")          # missing val
+    data["Tax_Code"] = data["Tax_Code"].mask(data["Tax_Code"] == "")                # unused val
+    data["Business_Area"] = data["Business_Area"].mask(data["Business_Area"] == "") # unused val
 
     # open items have no clearing document, coerce filling empty recs with
     # null, otherwise convert to int where clearing document exsits
@@ -1775,118 +2057,77 @@ def _parse_data_opt(data: DataFrame) -> DataFrame:
         data["Clearing_Document"],
     errors = "coerce").astype("UInt64")
 
-    data["LC_Amount"] = data["LC_Amount"].str.replace(".", "", regex = False).str.replace(",", ".", regex = False)
-    data["LC_Amount"] = data["LC_Amount"].mask(data["LC_Amount"].str.endswith("-"), "-" + data["LC_Amount"].str.rstrip("-"))
-    data["LC_Amount"] = pd.to_numeric(data["LC_Amount"]).astype("float64")
-
-    data["Document_Date"] = pd.to_datetime(data["Document_Date"], dayfirst = True).dt.date
-    data["Posting_Date"] = pd.to_datetime(data["Posting_Date"], dayfirst = True).dt.date
-    data["Posting_Key"] = pd.to_numeric(data["Posting_Key"])
-
-    # extract accounting params separated by a semicolon
-    # from 'Text' field into separate fields
-    data["Tokens"] = data["Text"].str.split(";")
-
-    # do no use assign() to add new fields as this
-    # creates a new dataframe by copying
-    data["Condition"] = pd.NA
-    data["Category"] = pd.NA
-    data["Customer"] = pd.NA
-    data["Agreement"] = pd.NA
-    data["Note"] = pd.NA
+    # the separators and the trailing minus sign are handled
+    # by a single chain of arrow kernels, where the sign is
+    # applied to the parsed floats instead of the strings
+    data["LC_Amount"] = _parse_amounts(data["LC_Amount"])
 
-    # get only token records containig at least 4 values
-    # and immediately convert the extracted vals to appropriate
-    # dtypes to save as much memory as possible
-    idx = data[data["Tokens"].str.len() >= 4].index
+    data["Document_Date"] = pd.to_datetime(data["Document_Date"], format = _SAP_DATE_FMT).dt.date
+    data["Posting_Date"] = pd.to_datetime(data["Posting_Date"], format = _SAP_DATE_FMT).dt.date
 
-    data.loc[idx, "Condition"] = data.loc[idx, "Tokens"].str.get(0)
-    data["Condition"] = data["Condition"].str.strip(" ")
-    data["Condition"] = data["Condition"].astype("category")
+    # posting keys are mandatory, hence the field doesn't need
+    # the nullable dtype and its mask; the categories built
+    # from the field are then backed by a plain numpy array
+    data["Posting_Key"] = data["Posting_Key"].astype("uint8")
 
-    data.loc[idx, "Category"] = data.loc[idx, "Tokens"].str.get(1)
-    data["Category"] = data["Category"].str.strip(" ")
+    # extract accounting params separated by a semicolon from 'Text' field
+    # into separate fields; texts containing less than 4 values yield nulls.
+    # All the tokens are classified within a single pass over the arrow
+    # string buffer, so that no intermediate python objects are created.
+    text = pa.array(data["Text"], type = pa.string(), from_pandas = True)
+    extracted = pc.extract_regex(text, options = _TEXT_TOKENS_OPTS)
+    tokens = {fld.name: vals for fld, vals in zip(extracted.type, extracted.flatten())}
+    null = pa.scalar(None, pa.string())
 
-    invaid_categs = (data["Category"].str.len() > 2)
+    categ_lengths = pc.utf8_length(tokens["Category"])
+    invaid_categs = pc.fill_null(pc.greater(categ_lengths, 2), False)
 
-    if invaid_categs.notna().any():
+    if pc.any(invaid_categs).as_py():
         # erase vals where category text length is >= 2,
         # which certainly not a valid category value.
         # The erased categories will not be listed in the user report, though.
-        invalid_vals = data.loc[invaid_categs, "Category"].unique()
-        invalid_vals = "; ".join(invalid_vals)
+        invalid_vals = pc.unique(pc.filter(tokens["Category"], invaid_categs)).to_pylist()
 
         _logger.warning(
             "Invalid category values found. The values will be removed form the data "
-            f"and won't be included in the final user report: {invalid_vals}"
+            "and won't be included in the final user report: %s", _LazyJoin("; ", invalid_vals)
         )
-        data.loc[invaid_categs, "Category"] = pd.NA
-
-    data["Category"] = data["Category"].astype("category")
-
-    data.loc[idx, "Customer"] = data.loc[idx, "Tokens"].str.get(2)
-
-    # save memory immediately
-    data["Customer"] = pd.to_numeric(data["Customer"], errors = "coerce").astype("UInt32")
-
-    data.loc[idx, "Agreement"] = data.loc[idx, "Tokens"].str.get(3)
-    data["Agreement"] = pd.to_numeric(data["Agreement"], errors = "coerce").astype("UInt32")
-
-    # returns none if token has no such index
-    data.loc[idx, "Note"] = data.loc[idx, "Tokens"].str.get(4)
-
-    # remove splitted text tokens from data
-    data.drop("Tokens", axis = 1, inplace = True)
-
-    cond_idx = data[data["Condition"].notna()].index
-    categ_idx = data[data["Category"].notna()].index
-    note_idx = data[data["Note"].notna()].index
 
-    if not cond_idx.empty:
-        data.loc[cond_idx, "Condition"] = data.loc[cond_idx, "Condition"].str.strip()
-
-    if not categ_idx.empty:
-        data.loc[categ_idx, "Category"] = data.loc[categ_idx, "Category"].str.strip()
+    # replace incorrect extracted entries with nan
+    cond_lengths = pc.utf8_length(tokens["Condition"])
+    tokens["Condition"] = pc.if_else(pc.equal(cond_lengths, 4), tokens["Condition"], null)
+    tokens["Category"] = pc.if_else(pc.equal(categ_lengths, 2), tokens["Category"], null)
 
-    if not note_idx.empty:
-        data.loc[note_idx, "Note"] = data.loc[note_idx, "Note"].str.strip()
-        data.loc[(data["Note"] == ""), "Note"] = pd.NA # missing vals
+    # numeric vals are cast directly to ints, any
+    # other vals are coerced to nulls; the 5th value
+    # (note) is null if the text contains no such value
+    for name in ("Customer", "Agreement"):
+        is_numeric = pc.match_substring_regex(tokens[name], options = _DIGITS_ONLY_OPTS)
+        tokens[name] = pc.cast(pc.if_else(is_numeric, tokens[name], null), pa.uint32())
 
-    incorr_cond_qry = data.query("Condition.notna() and Condition.str.len() != 4")
-    incorr_categ_qry = data.query("Category.notna() and Category.str.len() != 2")
+    tokens["Note"] = pc.if_else(pc.equal(tokens["Note"], ""), null, tokens["Note"])
 
-    # replace incorrect extracted entries with nan
-    data.loc[incorr_cond_qry.index, "Condition"] = pd.NA
-    data.loc[incorr_categ_qry.index, "Category"] = pd.NA
+    tokens = pa.table(tokens).to_pandas(types_mapper = _ARROW_DTYPES.get)
+    tokens.index = data.index
 
     # convert the extracted data to appropriate data types
-    data["Note"] = data["Note"].astype("string")
+    tokens = tokens.astype({
+        "Condition": "category",
+        "Category": "category",
+        "Note": "string[pyarrow]"
+    }, copy = False)
+
+    # insert all the token fields at once
+    data = pd.concat([data, tokens], axis = 1, copy = False)
 
     return data
 
-def convert_fbl3n_data_opt(file_path: str, multiproc: bool = False, n_workers: int = 5) -> DataFrame:
+def _read_fbl3n_data_opt(text: bytes) -> DataFrame:
     """
-    Converts data exported form FBL5N into a DataFrame object.
-
-    Params:
-    -------
-    file_path:
-        Path to the file containing FBL3N data.
-
-    n_workers:
-        Indicates number of workers for parallel data processing (optimal 5).
-
-    Returns:
-    --------
-    A DataFrame object. The result of data conversion.
+    Reads a cleaned FBL5N text into a DataFrame object.
     """
 
-    MAX_ROWS_SNG = 1000
-
-    text = read_textual_file(file_path)
-    text = _clean_text_opt([text], patt = r"^\|\s+\d{4}\|.*$")
-
-    data = pd.read_csv(StringIO(text),
+    data = pd.read_csv(BytesIO(text),
         names = list(_FBL3N_HEADER),
         sep = '|',
         engine = "pyarrow",
@@ -1898,15 +2139,15 @@ def convert_fbl3n_data_opt(file_path: str, multiproc: bool = False, n_workers: i
             "Fiscal_Year": "UInt16",
             "Period": "UInt8",
             "GL_Account": "UInt32",
-            "Assignment": "string",
+            "Assignment": "string[pyarrow]",
             "Document_Number": "UInt64",
-            "Business_Area": "string",
+            "Business_Area": "string[pyarrow]",
             "Document_Type": "category",
             "Posting_Key": "UInt8",
-            "LC_Amount": "string",
-            "Tax_Code": "string",
-            "Clearing_Document": "string",
-            "Text": "string"
+            "LC_Amount": "string[pyarrow]",
+            "Tax_Code": "string[pyarrow]",
+            "Clearing_Document": "string[pyarrow]",
+            "Text": "string[pyarrow]"
         }
     )
 
@@ -1916,77 +2157,108 @@ def convert_fbl3n_data_opt(file_path: str, multiproc: bool = False, n_workers: i
         "Text", "LC_Amount", "Clearing_Document"
     ]
 
-    for col in str_columns:
-        data[col] = data[col].str.strip()
+    # the fields are trimmed by the arrow kernel and
+    # written back at once, instead of one by one
+    trimmed = pa.table({
+        col: pc.utf8_trim_whitespace(pa.array(data[col], type = pa.string(), from_pandas = True))
+        for col in str_columns
+    })
+
+    data = data.assign(**trimmed.to_pandas(types_mapper = _ARROW_DTYPES.get))
+
+    return data
+
+def _parse_fbl3n_chunk_opt(text: bytes) -> DataFrame:
+    """
+    Reads and parses a part of a cleaned FBL5N text.
+    """
+
+    data = _read_fbl3n_data_opt(text)
+    parsed = _parse_data_opt(data)
+
+    # each chunk encodes its own categories, so that the
+    # values are hashed only once, inside of the workers
+    parsed = parsed.astype({col: "category" for col in _FBL3N_OPT_CATEG_FIELDS}, copy = False)
+
+    return parsed
+
+def _split_text(text: bytes, n_chunks: int):
+    """
+    Yields chunks of a text split at the
+    line breaks nearest to even offsets.
+    """
+
+    chunk_size = -(-len(text) // n_chunks)
+    start = 0
+
+    while start < len(text):
+        brk = text.find(b"\n", start + chunk_size)
+        stop = len(text) if brk == -1 else brk + 1
+        yield text[start:stop]
+        start = stop
+
+def convert_fbl3n_data_opt(file_path: str, multiproc: bool = False, n_workers: int = 5) -> DataFrame:
+    """
+    Converts data exported form FBL5N into a DataFrame object.
+
+    Params:
+    -------
+    file_path:
+        Path to the file containing FBL3N data.
+
+    n_workers:
+        Indicates number of workers for parallel data processing (optimal 5).
+
+    Returns:
+    --------
+    A DataFrame object. The result of data conversion.
+    """
+
+    MAX_ROWS_SNG = 1000
+
+    text = read_textual_file(file_path)
+    text = _clean_text_opt([text], patt = _FBL3N_ITEM_RE)
 
     # if there' small number of rows
     # to process, use single processing
-    if data.shape[0] <= MAX_ROWS_SNG:
+    if text.count(b"\n") < MAX_ROWS_SNG:
         multiproc = False
 
     if not multiproc:
-        parsed = _parse_data_opt(data)
-        assert parsed is data, "Object references don't match!"
+        parsed = _parse_fbl3n_chunk_opt(text)
     else:
 
         assert n_workers >= 2, "Argument 'n_workers' has incorrect value!"
 
-        # split data into smaller manageable chunks
-        data_chunks = np.array_split(data, n_workers)
-        del data
+        # split text into smaller manageable chunks; each chunk is read
+        # by its own worker, so that no sliced arrow arrays are passed
+        # between the processes. The chunks are sliced only as they are
+        # sent to the workers and the generator holds the last reference
+        # to the text, so the text is released once the last chunk is sent
+        text_chunks = _split_text(text, n_workers)
+        del text
 
-        # init pool of workers and let them process the data chunks
+        # the parsed parts are collected in the order
+        # of the chunks as soon as they become available
         with Pool(n_workers) as data_pool:
-            parsed = data_pool.map(_parse_data_opt, data_chunks)
-            del data_chunks
+            parsed = list(data_pool.imap(_parse_fbl3n_chunk_opt, text_chunks))
 
         # combine the data parts returned by workers
-        parsed = pd.concat(parsed, copy = False)
+        parsed = _combine_fbl3n_chunks(parsed, _FBL3N_OPT_CATEG_FIELDS)
 
     if parsed.empty:
         return None
 
-    # check & reset data index
-    if parsed.index.has_duplicates:
-        parsed.reset_index(inplace = True, drop = True)
-
-    categorical = (
-        "Document_Type",
-        "Condition",
-        "Category",
-        "Posting_Key",
-        "Assignment",
-        "Business_Area",
-        "Tax_Code",
-        "GL_Account",       # added
-        "Document_Number",  # added
-        "Fiscal_Year"       # added
-    )
-
-    # finally, convert the respective data fields to (or back to)
-    # categories. This is needed particularly following data concatenation
-    for col in categorical:
-        parsed[col] = parsed[col].astype("category")
-
     # validate extracted categories by comparing
-    # the values with teh list of official categs
-    categs = (
-        "B1", "B2", "B3", "B4",
-        "B5", "B6", "B7", "B8",
-        "BO", "C1", "C2", "C3",
-        "D1", "DS", "E1", "EM",
-        "FE", "FS", "S1", "SE",
-        "YJ", "EU", "GR"
-    )
+    # the values with the set of official categs
+    undef_cats = set(parsed["Category"].cat.categories) - _VALID_CATEGS
 
-    if not parsed["Category"].cat.categories.isin(categs).all():
-        undef_cats = set(parsed['Category'].cat.categories) - set(categs)
-        _logger.warning(f"Undefined categories found: '{'; '.join(undef_cats)}'")
+    if len(undef_cats) != 0:
+        _logger.warning("Undefined categories found: '%s'", _LazyJoin("; ", undef_cats))
 
     # ensure all amounts with pstkey = 50 are negative
     # since .dat files store LC amounts as absolute vals
-    mask = ((parsed["Posting_Key"] == 50) & (parsed["LC_Amount"] > 0))
-    parsed.loc[mask, "LC_Amount"] = -1 * parsed.loc[mask, "LC_Amount"]
+    parsed["LC_Amount"] = _sign_credit_amounts(parsed)
 
     # resetting index will remove any duplicated index vals
     # as a result of data concatenation
@@ -7,15 +7,87 @@ The main purpose of the functionality is saving runtime
 states of processed entities.
 """
 
+import atexit
 from enum import Enum
 import json
 import logging
+import os
 from os.path import exists
+import sys
+import time
 from typing import Union
 
 _logger = logging.getLogger("master")
 _ent_states: dict = None
 _rec_path: str = None
+_jrnl_path: str = None
+
+# saved states are kept in memory and written to the journal once
+# the interval (secs) has elapsed since the last write, which is
+# only checked when a next state is saved
+_FLUSH_INTERVAL = 2.0
+
+# states that guard slow, non-repeatable data exports from SAP
+# and the messages for users are written to disk immediately
+_SYNCED_STATES = frozenset((
+    "fbl3n_data_exported",
+    "se16_no_kona_data",
+    "se16_kona_data_exported",
+    "se16_kote_data_exported",
+    "zsd25_glob_data_exported",
+    "zsd25_loc_data_exported",
+    "zsd25_no_glob_data",
+    "fs10n_data_exported",
+    "user_warning",
+    "user_error"
+))
+_pending: list = []
+_last_flush: float = 0.0
+
+# account numbers mapped to their interned string
+# keys, so that each account is converted only once
+_acc_keys: dict = {}
+
+# default processing states of a country; the per-account
+# states are replaced with new dicts for each country
+_DEFAULT_STATES = {
+    "reconciled": False,
+    "db_updated": False,
+    "info": False,
+    "fbl3n_data_exported": False,
+    "fbl3n_data_processed": False,
+    "se16_no_kona_data": False,
+    "se16_kona_data_exported": False,
+    "se16_kote_data_exported": False,
+    "se16_kona_data_processed": False,
+    "se16_kote_data_processed": False,
+    "zsd25_glob_data_exported": False,
+    "zsd25_glob_data_processed": False,
+    "zsd25_glob_data_calculated": False,
+    "zsd25_loc_data_exported": False,
+    "zsd25_loc_data_processed": False,
+    "zsd25_loc_data_calculated": False,
+    "zsd25_no_glob_data": False,
+    "yearly_summary_retrieved": False,
+    "text_summary_retrieved": {},
+    "fs10n_data_exported": {},
+    "fs10n_data_processed": {},
+    "user_warning": "",
+    "user_error": ""
+}
+
+def _acc_key(acc: Union[int, str]) -> str:
+    """
+    Returns the recovery data key
+    of an account number.
+    """
+
+    key = _acc_keys.get(acc)
+
+    if key is None:
+        key = _acc_keys[acc] = sys.intern(str(acc))
+
+    return key
 
 class states(Enum):
     """
@@ -78,8 +150,11 @@ def initialize(rec_path: str, countries: list, rules: dict):
 
     global _ent_states
     global _rec_path
+    global _jrnl_path
 
     _rec_path = rec_path
+    _jrnl_path = rec_path + ".jrnl"
+    _pending.clear()
 
     if not exists(_rec_path):
         clear_states()
@@ -87,9 +162,17 @@ def initialize(rec_path: str, countries: list, rules: dict):
     with open(_rec_path, 'r', encoding = "utf-8") as stream:
         ent_states = json.loads(stream.read())
 
-    # use previous states to recover app
+    # use previous states to recover app; the states saved
+    # since the last snapshot are replayed from the journal
+    # and the result is collapsed into a new snapshot. If
+    # there's no journal, then the snapshot is up to date.
     if len(ent_states) != 0:
         _ent_states = ent_states
+
+        if exists(_jrnl_path):
+            _replay_journal(_ent_states)
+            _write_snapshot(_ent_states)
+
         return
 
     # no failure - init app with default states
@@ -111,6 +194,7 @@ def clear():
     """
 
     global _rec_path
+    global _jrnl_path
     global _ent_states
 
     _logger.info("Clearing application recovery ...")
@@ -118,6 +202,7 @@ def clear():
     clear_states()
 
     _rec_path = None
+    _jrnl_path = None
     _ent_states = None
 
 def clear_states():
@@ -137,9 +222,15 @@ def clear_states():
     global _ent_states
 
     _ent_states = {}
+    _pending.clear()
+
+    # the journal is removed first, so that no outdated
+    # states can be replayed onto the cleared data
+    if exists(_jrnl_path):
+        os.remove(_jrnl_path)
 
     with open(_rec_path, 'w', encoding = "utf-8") as stream:
-        json.dump(_ent_states, stream)
+        stream.write(json.dumps(_ent_states))
 
 def reset_states(countries: list, rules: dict) -> dict:
     """
@@ -167,42 +258,93 @@ def reset_states(countries: list, rules: dict) -> dict:
 
     for cntry in countries:
 
-        new_ent_states[cntry] = {}
-        new_ent_states[cntry]["reconciled"] = False
-        new_ent_states[cntry]["db_updated"] = False
-        new_ent_states[cntry]["info"] = False
-        new_ent_states[cntry]["fbl3n_data_exported"] = False
-        new_ent_states[cntry]["fbl3n_data_processed"] = False
-        new_ent_states[cntry]["se16_no_kona_data"] = False
-        new_ent_states[cntry]["se16_kona_data_exported"] = False
-        new_ent_states[cntry]["se16_kote_data_exported"] = False
-        new_ent_states[cntry]["se16_kona_data_processed"] = False
-        new_ent_states[cntry]["se16_kote_data_processed"] = False
-        new_ent_states[cntry]["zsd25_glob_data_exported"] = False
-        new_ent_states[cntry]["zsd25_glob_data_processed"] = False
-        new_ent_states[cntry]["zsd25_glob_data_calculated"] = False
-        new_ent_states[cntry]["zsd25_loc_data_exported"] = False
-        new_ent_states[cntry]["zsd25_loc_data_processed"] = False
-        new_ent_states[cntry]["zsd25_loc_data_calculated"] = False
-        new_ent_states[cntry]["zsd25_no_glob_data"] = False
-        new_ent_states[cntry]["yearly_summary_retrieved"] = False
-        new_ent_states[cntry]["text_summary_retrieved"] = {}
-        new_ent_states[cntry]["fs10n_data_exported"] = {}
-        new_ent_states[cntry]["fs10n_data_processed"] = {}
-        new_ent_states[cntry]["user_warning"] = ""
-        new_ent_states[cntry]["user_error"] = ""
-
-        for acc in rules[cntry]["accounts"]:
-            new_ent_states[cntry]["text_summary_retrieved"][str(acc)] = False
-            new_ent_states[cntry]["fs10n_data_exported"][str(acc)] = False
-            new_ent_states[cntry]["fs10n_data_processed"][str(acc)] = False
+        cntry_states = _DEFAULT_STATES.copy()
+        accs = [_acc_key(acc) for acc in rules[cntry]["accounts"]]
 
-    with open(_rec_path, 'w', encoding = "utf-8") as stream:
-        json.dump(new_ent_states, stream, indent = 4)
+        cntry_states["text_summary_retrieved"] = dict.fromkeys(accs, False)
+        cntry_states["fs10n_data_exported"] = dict.fromkeys(accs, False)
+        cntry_states["fs10n_data_processed"] = dict.fromkeys(accs, False)
+
+        new_ent_states[cntry] = cntry_states
+
+    _write_snapshot(new_ent_states)
 
     return new_ent_states
 
-def save_state(country: str, key: str, val: Union[bool,str], acc: Union[int, str] = None):
+def _write_snapshot(ent_states: dict):
+    """
+    Writes complete recovery data to the
+    recovery file and removes the journal
+    of the states saved since then.
+    """
+
+    # the data is encoded in one shot and written at once, rather
+    # than streamed to the file in many small encoder chunks
+    with open(_rec_path, 'w', encoding = "utf-8") as stream:
+        stream.write(json.dumps(ent_states, indent = 4))
+
+    if exists(_jrnl_path):
+        os.remove(_jrnl_path)
+
+def _replay_journal(ent_states: dict) -> dict:
+    """
+    Applies the states saved in the journal
+    onto the recovery data loaded from the
+    recovery file.
+    """
+
+    with open(_jrnl_path, 'r', encoding = "utf-8") as stream:
+        for line in stream:
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                # the last entry might have been written only
+                # partially if the app crashed while saving it
+                _logger.warning("Incomplete recovery journal entry skipped.")
+                break
+
+            if entry["acc"] is None:
+                ent_states[entry["country"]][entry["key"]] = entry["val"]
+            else:
+                ent_states[entry["country"]][entry["key"]][entry["acc"]] = entry["val"]
+
+    return ent_states
+
+def checkpoint():
+    """
+    Writes the saved processing states that
+    haven't been written yet to the journal.
+
+    Params:
+    -------
+    None.
+
+    Returns:
+    --------
+    None.
+    """
+
+    global _last_flush
+
+    _last_flush = time.monotonic()
+
+    if len(_pending) == 0:
+        return
+
+    with open(_jrnl_path, 'a', encoding = "utf-8") as stream:
+        stream.writelines(_pending)
+        stream.flush()
+        os.fsync(stream.fileno())
+
+    _pending.clear()
+
+# buffered states are written as well when the interpreter exits
+# normally or on an unhandled exception; this doesn't apply if the
+# process is killed or crashes hard, which is why the states that
+# guard the data exports are never buffered
+atexit.register(checkpoint)
+
+def save_state(country: str, key: str, val: Union[bool,str], acc: Union[int, str] = None, force: bool = False):
     """
     Stores new value to recovery data defined by country and parameter name. \n
     If account is provided, then the new value will be set to data defined by \n
@@ -223,6 +365,12 @@ def save_state(country: str, key: str, val: Union[bool,str], acc: Union[int, str
     acc:
         Account number, for which a processing state will be saved.
 
+    force:
+        If True, then the state is written to disk immediately, \n
+        along with any other states that haven't been written yet. \n
+        States of data exports and user messages are always written \n
+        immediately.
+
     Returns:
     --------
     None.
@@ -241,10 +389,22 @@ def save_state(country: str, key: str, val: Union[bool,str], acc: Union[int, str
             "Saving processing state: "
             f"country = '{country}'; key = '{key}'; acc = '{acc}'; val = {val}"
         )
-        _ent_states[country][key][str(acc)] = val
+        _ent_states[country][key][_acc_key(acc)] = val
 
-    with open(_rec_path, 'w', encoding = "utf-8") as stream:
-        json.dump(_ent_states, stream, indent = 4)
+    entry = {
+        "country": country,
+        "key": key,
+        "acc": None if acc is None else _acc_key(acc),
+        "val": val
+    }
+
+    # only the change is appended to the journal instead of
+    # rewriting the complete recovery data on each call; the
+    # changes are buffered to avoid a disk sync on each call
+    _pending.append(json.dumps(entry) + "\n")
+
+    if force or key in _SYNCED_STATES or time.monotonic() - _last_flush >= _FLUSH_INTERVAL:
+        checkpoint()
 
 def get_state(country: str, key: str, acc: Union[int, str] = None) -> Union[bool,str]:
     """
@@ -272,6 +432,6 @@ def get_state(country: str, key: str, acc: Union[int, str] = None) -> Union[bool
     if acc is None:
         state = _ent_states[country][key]
     else:
-        state = _ent_states[country][key][str(acc)]
+        state = _ent_states[country][key][_acc_key(acc)]
 
     return state
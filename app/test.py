@@ -1,5 +1,8 @@
 from datetime import date, datetime
 from engine import biaDates2 as dates
+from engine import biaMail as mail
+from exchangelib import FileAttachment, Message
+from engine import biaProcessor as proc
 import yaml
 import sys
 from os.path import join
@@ -133,4 +136,71 @@ def test_date_calculator():
 	else:
 		print("Test cases failed:", n_failed)
 
+def test_bonus_calcs_with_unassigned_account():
+	"""
+	Tests that bonus calculations treat an account
+	whose text items contain no agreement as an
+	account with a zero amount on all agreements.
+	"""
+
+	def get_text_summary(agreements: list, amounts: list) -> pd.DataFrame:
+		return pd.DataFrame({
+			"Agreement": pd.array(agreements, dtype = "UInt32"),
+			"LC_Amount_Sum": amounts
+		})
+
+	bonus_data = pd.DataFrame({
+		"Rebate_Recipient": [1], "Name": [""], "Country": ["DE"],
+		"Agreement_Type_Code": ["Z1"], "Agreement": pd.array([10000001], dtype = "UInt32"),
+		"Status": ["B"], "Description_Of_Agreement": [""], "Condition_Value": [0.0],
+		"Condition_Based_Value": [0.0], "Payments": [0.0], "Open_Accruals": [1.0],
+		"Currency": ["EUR"], "Arrangement_Calendar": [""],
+		"Valid_From": [date(2023, 1, 1)], "Valid_To": [date(2023, 12, 31)]
+	})
+
+	# the only item of the first account has no agreement
+	txt_summs = {
+		"66010030": get_text_summary([None], [5.0]),
+		"66010040": get_text_summary([10000001], [0.0])
+	}
+
+	le_calcs = proc.calculate_le_bonus_data(txt_summs, bonus_data, "EUR", 1.0)
+	hq_calcs = proc.calculate_hq_bonus_data(txt_summs, bonus_data, "EUR", 1.0)
+
+	for calcs in (le_calcs, hq_calcs):
+		assert calcs.loc[0, "66010030"] == 0.0
+		assert calcs.loc[0, "66010040"] == 0.0
+		assert calcs.loc[0, "Difference"] == -1.0
+
+	print("Bonus calculation test passed.")
+
+def test_attachment_check_without_attachments():
+	"""
+	Tests that a message without any attachments
+	is evaluated as containing no attachment.
+	"""
+
+	msg = Message()
+	assert not mail.contains_attachment(msg)
+	assert not mail.contains_attachment(msg, ".pdf")
+
+	# the flag may be set while the message holds no attachments
+	msg.has_attachments = True
+	assert not mail.contains_attachment(msg)
+	assert not mail.contains_attachment(msg, ".pdf")
+
+	# the flag is None if it wasn't fetched with the message,
+	# which must not hide the attachments the message contains
+	msg = Message()
+	msg.has_attachments = None
+	msg.attach(FileAttachment(name = "rates.PDF", content = b"data"))
+	assert mail.contains_attachment(msg)
+	assert mail.contains_attachment(msg, ".pdf")
+	assert not mail.contains_attachment(msg, ".xlsx")
+	assert len(mail.get_attachments(msg)) == 1
+
+	print("Attachment check test passed.")
+
 test_date_calculator()
+test_bonus_calcs_with_unassigned_account()
+test_attachment_check_without_attachments()